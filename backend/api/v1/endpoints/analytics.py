@@ -1,9 +1,8 @@
 """
 Analytics endpoints - Geographic, temporal, and business intelligence
 """
-from fastapi import APIRouter, HTTPException, Query, Path
+from fastapi import APIRouter, HTTPException, Query, Path, Response
 from typing import Optional
-import logging
 
 from backend.models.schemas import (
     GeoAnomalyHotspotsResponse,
@@ -14,9 +13,10 @@ from backend.models.schemas import (
     MerchantChannelRiskResponse,
     TransactionExplanation
 )
+from backend.services.executor import run_sync
 from backend.services.analytics import AnalyticsService
+from backend.services.fraud_detection import FraudDetectionService
 
-logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
@@ -31,12 +31,8 @@ async def get_geo_anomaly_hotspots():
     - Top risky locations
     - Heat map data for visualization
     """
-    try:
-        data = AnalyticsService.get_geo_anomaly_hotspots()
-        return GeoAnomalyHotspotsResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting geo anomalies: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(AnalyticsService.get_geo_anomaly_hotspots)
+    return GeoAnomalyHotspotsResponse(**data)
 
 
 @router.get("/predictive-risk-scores", response_model=PredictiveRiskScoreResponse)
@@ -49,12 +45,8 @@ async def get_predictive_risk_scores(
     Uses behavioral indicators to predict which accounts are likely
     to be compromised, enabling proactive protection.
     """
-    try:
-        data = AnalyticsService.get_predictive_risk_scores(limit=limit)
-        return PredictiveRiskScoreResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting predictive risk scores: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(FraudDetectionService.get_predictive_risk_scores, limit=limit)
+    return PredictiveRiskScoreResponse(**data)
 
 
 @router.get("/financial-impact", response_model=FinancialImpactResponse)
@@ -70,12 +62,8 @@ async def get_financial_impact(
     - False positive impact
     - Net savings and ROI
     """
-    try:
-        data = AnalyticsService.get_financial_impact(period_days=period_days)
-        return FinancialImpactResponse(**data)
-    except Exception as e:
-        logger.error(f"Error calculating financial impact: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(AnalyticsService.get_financial_impact, period_days=period_days)
+    return FinancialImpactResponse(**data)
 
 
 @router.get("/customer-experience", response_model=CustomerExperienceResponse)
@@ -89,33 +77,28 @@ async def get_customer_experience():
     - Customer complaints
     - Churn rate
     """
-    try:
-        data = AnalyticsService.get_customer_experience_metrics()
-        return CustomerExperienceResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting customer experience metrics: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(AnalyticsService.get_customer_experience_metrics)
+    return CustomerExperienceResponse(**data)
 
 
-@router.get("/temporal-trends", response_model=TemporalTrendsResponse)
+@router.get("/temporal-trends", response_model=None, responses={200: {"model": TemporalTrendsResponse}})
 async def get_temporal_trends(
-    months: int = Query(12, description="Historical months", ge=1, le=24)
+    months: int = Query(12, description="Historical months", ge=1, le=24),
+    pixels: int = Query(1200, description="Chart width in pixels; longer histories are M4-downsampled to at most 4 points per pixel", ge=50, le=5000)
 ):
     """
     **TILE 16: Temporal Trends & Forecasting** - Time series analysis
     
     Provides:
-    - Historical fraud trends
+    - Historical fraud trends (downsampled to the chart width)
     - 30-day forecast
     - High-risk days identification
     - Emerging pattern detection
     """
-    try:
-        data = AnalyticsService.get_temporal_trends(months=months)
-        return TemporalTrendsResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting temporal trends: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(AnalyticsService.get_temporal_trends, months=months, pixels=pixels)
+    # Validated once here; serialized by pydantic-core without FastAPI re-validating
+    response = TemporalTrendsResponse(**data)
+    return Response(response.model_dump_json(exclude_none=True), media_type="application/json")
 
 
 @router.get("/merchant-channel-risk", response_model=MerchantChannelRiskResponse)
@@ -128,12 +111,8 @@ async def get_merchant_channel_risk():
     - Merchant categories (retail, travel, utilities, etc.)
     Provides actionable recommendations.
     """
-    try:
-        data = AnalyticsService.get_merchant_channel_risk()
-        return MerchantChannelRiskResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting merchant/channel risk: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(AnalyticsService.get_merchant_channel_risk)
+    return MerchantChannelRiskResponse(**data)
 
 
 @router.get("/transaction-explanation/{transaction_id}", response_model=TransactionExplanation)
@@ -146,16 +125,10 @@ async def explain_transaction(
     Provides interpretable explanation of why a specific transaction
     was flagged, including feature importances and recommended action.
     """
-    try:
-        data = AnalyticsService.explain_transaction(transaction_id)
-        
-        if 'error' in data:
-            raise HTTPException(status_code=404, detail=data['error'])
-        
-        return TransactionExplanation(**data)
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Error explaining transaction: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(AnalyticsService.explain_transaction, transaction_id)
+    
+    if 'error' in data:
+        raise HTTPException(status_code=404, detail=data['error'])
+    
+    return TransactionExplanation(**data)
 
@@ -1,9 +1,8 @@
 """
 Dashboard endpoints - Tier 1 & 2 (Executive Overview & Operational Command Center)
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Query, Request, Response
 from typing import Optional
-import logging
 
 from backend.models.schemas import (
     ExecutiveOverviewResponse,
@@ -13,9 +12,10 @@ from backend.models.schemas import (
     BehavioralAnomaliesResponse,
     SmartAlertFeedResponse
 )
+from backend.api.v1.streaming import NDJSON_CONTENT, VARY_ACCEPT, ndjson_response, record, wants_ndjson
+from backend.services.executor import run_sync
 from backend.services.fraud_detection import FraudDetectionService
 
-logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
@@ -33,16 +33,17 @@ async def get_executive_overview(
     - Average detection time
     - Pending alerts count
     """
-    try:
-        data = FraudDetectionService.get_executive_overview(hours=hours)
-        return ExecutiveOverviewResponse(**data)
-    except Exception as e:
-        logger.error(f"Error in executive overview: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(FraudDetectionService.get_executive_overview, hours=hours)
+    return ExecutiveOverviewResponse(**data)
 
 
-@router.get("/high-risk-transactions", response_model=HighRiskTransactionsFeedResponse)
+@router.get(
+    "/high-risk-transactions",
+    response_model=None,
+    responses={200: {"model": HighRiskTransactionsFeedResponse, "content": NDJSON_CONTENT}}
+)
 async def get_high_risk_transactions(
+    request: Request,
     limit: int = Query(50, description="Maximum transactions to return", ge=1, le=200)
 ):
     """
@@ -50,13 +51,25 @@ async def get_high_risk_transactions(
     
     Returns prioritized list of transactions requiring immediate attention,
     categorized by severity (critical, high, medium priority).
+    
+    Send `Accept: application/x-ndjson` to stream one `alert` record per
+    line instead, followed by a final `summary` record with the counts.
     """
-    try:
-        data = FraudDetectionService.get_high_risk_transactions(limit=limit)
-        return HighRiskTransactionsFeedResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting high-risk transactions: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(FraudDetectionService.get_high_risk_transactions, limit=limit)
+    
+    if wants_ndjson(request):
+        summary = {k: v for k, v in data.items() if k != 'critical_alerts'}
+        rows = [record('alert', alert) for alert in data['critical_alerts']]
+        rows.append(record('summary', summary))
+        return ndjson_response(rows, headers=VARY_ACCEPT)
+    
+    # Validated once here; serialized by pydantic-core without FastAPI re-validating
+    response = HighRiskTransactionsFeedResponse(**data)
+    return Response(
+        response.model_dump_json(exclude_none=True),
+        media_type="application/json",
+        headers=VARY_ACCEPT
+    )
 
 
 @router.get("/fraud-velocity-heatmap", response_model=FraudVelocityHeatmapResponse)
@@ -69,12 +82,8 @@ async def get_fraud_velocity_heatmap(
     Shows fraud patterns by hour to identify peak attack windows.
     Helps with resource allocation and threat anticipation.
     """
-    try:
-        data = FraudDetectionService.get_fraud_velocity_heatmap(hours=hours)
-        return FraudVelocityHeatmapResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting fraud velocity: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(FraudDetectionService.get_fraud_velocity_heatmap, hours=hours)
+    return FraudVelocityHeatmapResponse(**data)
 
 
 @router.get("/fraud-type-breakdown", response_model=FraudTypeBreakdownResponse)
@@ -85,12 +94,8 @@ async def get_fraud_type_breakdown():
     Analyzes fraud by type (account takeover, money laundering, etc.)
     with week-over-week trends and emerging threats.
     """
-    try:
-        data = FraudDetectionService.get_fraud_type_breakdown()
-        return FraudTypeBreakdownResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting fraud type breakdown: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(FraudDetectionService.get_fraud_type_breakdown)
+    return FraudTypeBreakdownResponse(**data)
 
 
 @router.get("/behavioral-anomalies", response_model=BehavioralAnomaliesResponse)
@@ -103,15 +108,11 @@ async def get_behavioral_anomalies():
     - Device switching
     - Dormant account reactivation
     """
-    try:
-        data = FraudDetectionService.get_behavioral_anomalies()
-        return BehavioralAnomaliesResponse(**data)
-    except Exception as e:
-        logger.error(f"Error detecting behavioral anomalies: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(FraudDetectionService.get_behavioral_anomalies)
+    return BehavioralAnomaliesResponse(**data)
 
 
-@router.get("/smart-alerts", response_model=SmartAlertFeedResponse)
+@router.get("/smart-alerts", response_model=None, responses={200: {"model": SmartAlertFeedResponse}})
 async def get_smart_alerts(
     hours: int = Query(24, description="Time window in hours", ge=1, le=168)
 ):
@@ -124,10 +125,9 @@ async def get_smart_alerts(
     - Model performance issues
     - High transaction volumes
     """
-    try:
-        data = FraudDetectionService.generate_smart_alerts(hours=hours)
-        return SmartAlertFeedResponse(**data)
-    except Exception as e:
-        logger.error(f"Error generating smart alerts: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(FraudDetectionService.generate_smart_alerts, hours=hours)
+    
+    # Validated once here; serialized by pydantic-core without FastAPI re-validating
+    response = SmartAlertFeedResponse(**data)
+    return Response(response.model_dump_json(exclude_none=True), media_type="application/json")
 
@@ -1,17 +1,16 @@
 """
 Model monitoring endpoints - ML performance tracking
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
 from typing import List, Dict, Any
-import logging
 
 from backend.models.schemas import (
     ModelHealthDashboardResponse,
     ConfusionMatrixResponse
 )
+from backend.services.executor import run_sync
 from backend.services.model_monitoring import ModelMonitoringService
 
-logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
@@ -28,12 +27,8 @@ async def get_model_health():
     - Feature drift alerts
     - Retraining recommendations
     """
-    try:
-        data = ModelMonitoringService.get_model_health()
-        return ModelHealthDashboardResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting model health: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(ModelMonitoringService.get_model_health)
+    return ModelHealthDashboardResponse(**data)
 
 
 @router.get("/confusion-matrix", response_model=ConfusionMatrixResponse)
@@ -49,12 +44,8 @@ async def get_confusion_matrix():
     - False positive/negative rates
     - Cost impact analysis
     """
-    try:
-        data = ModelMonitoringService.get_confusion_matrix()
-        return ConfusionMatrixResponse(**data)
-    except Exception as e:
-        logger.error(f"Error getting confusion matrix: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(ModelMonitoringService.get_confusion_matrix)
+    return ConfusionMatrixResponse(**data)
 
 
 @router.get("/feature-importance", response_model=List[Dict[str, Any]])
@@ -65,10 +56,6 @@ async def get_feature_importance():
     Returns feature importance scores across all predictions
     to understand which signals matter most for fraud detection.
     """
-    try:
-        importances = ModelMonitoringService.get_feature_importance_global()
-        return importances
-    except Exception as e:
-        logger.error(f"Error getting feature importance: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    importances = await run_sync(ModelMonitoringService.get_feature_importance_global)
+    return importances
 
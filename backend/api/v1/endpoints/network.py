@@ -1,19 +1,24 @@
 """
 Network analysis endpoints - Fraud rings and account relationships
 """
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Query, Request, Response
 from typing import Optional, List, Dict, Any
-import logging
 
 from backend.models.schemas import FraudNetworkGraphResponse
+from backend.api.v1.streaming import NDJSON_CONTENT, VARY_ACCEPT, ndjson_response, record, wants_ndjson
+from backend.services.executor import run_sync
 from backend.services.network_analysis import NetworkAnalysisService
 
-logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
-@router.get("/fraud-network-graph", response_model=FraudNetworkGraphResponse)
+@router.get(
+    "/fraud-network-graph",
+    response_model=None,
+    responses={200: {"model": FraudNetworkGraphResponse, "content": NDJSON_CONTENT}}
+)
 async def get_fraud_network_graph(
+    request: Request,
     min_transactions: int = Query(3, description="Minimum transactions to include connection", ge=1, le=10),
     min_fraud_prob: float = Query(0.6, description="Minimum fraud probability", ge=0.0, le=1.0)
 ):
@@ -27,20 +32,36 @@ async def get_fraud_network_graph(
     - Network statistics
     
     Returns nodes (accounts) and edges (transactions) for graph visualization.
+    
+    Send `Accept: application/x-ndjson` to stream `node`, `edge` and `ring`
+    records one per line instead, followed by a final `summary` record.
     """
-    try:
-        data = NetworkAnalysisService.get_fraud_network_graph(
-            min_transactions=min_transactions,
-            min_fraud_prob=min_fraud_prob
-        )
-        return FraudNetworkGraphResponse(**data)
-    except Exception as e:
-        logger.error(f"Error building fraud network graph: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    data = await run_sync(
+        NetworkAnalysisService.get_fraud_network_graph,
+        min_transactions=min_transactions,
+        min_fraud_prob=min_fraud_prob
+    )
+    
+    if wants_ndjson(request):
+        rows = [record('node', node) for node in data['nodes']]
+        rows += [record('edge', edge) for edge in data['edges']]
+        rows += [record('ring', ring) for ring in data['fraud_rings']]
+        rows.append(record('summary', {
+            'rings_detected': data['rings_detected'],
+            'total_accounts': data['total_accounts'],
+            'total_volume': data['total_volume']
+        }))
+        return ndjson_response(rows, headers=VARY_ACCEPT)
+    
+    # Validated once here; serialized by pydantic-core without FastAPI re-validating
+    response = FraudNetworkGraphResponse(**data)
+    return Response(response.model_dump_json(), media_type="application/json", headers=VARY_ACCEPT)
 
 
-@router.get("/mule-accounts", response_model=List[Dict[str, Any]])
+@router.get("/mule-accounts", response_model=List[Dict[str, Any]], responses={200: {"content": NDJSON_CONTENT}})
 async def detect_mule_accounts(
+    request: Request,
+    response: Response,
     min_senders: int = Query(5, description="Minimum unique senders", ge=3, le=20),
     redistribution_threshold: float = Query(0.8, description="Min redistribution ratio", ge=0.5, le=1.0)
 ):
@@ -53,14 +74,18 @@ async def detect_mule_accounts(
     - Show high pass-through behavior
     
     These patterns indicate potential money mule activity.
+    
+    Send `Accept: application/x-ndjson` to stream one account per line instead.
     """
-    try:
-        mule_accounts = NetworkAnalysisService.detect_mule_accounts(
-            min_senders=min_senders,
-            redistribution_threshold=redistribution_threshold
-        )
-        return mule_accounts
-    except Exception as e:
-        logger.error(f"Error detecting mule accounts: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
+    mule_accounts = await run_sync(
+        NetworkAnalysisService.detect_mule_accounts,
+        min_senders=min_senders,
+        redistribution_threshold=redistribution_threshold
+    )
+    
+    if wants_ndjson(request):
+        return ndjson_response(mule_accounts, headers=VARY_ACCEPT)
+    
+    response.headers.update(VARY_ACCEPT)
+    return mule_accounts
 
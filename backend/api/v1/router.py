@@ -1,11 +1,18 @@
 """
 API v1 router - Combines all endpoint routers
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
 from backend.api.v1.endpoints import dashboard, analytics, network, model_monitoring
+from backend.data.data_loader import data_loader
 
-api_router = APIRouter()
+
+async def ensure_data_loaded() -> None:
+    """Load the dataset off the event loop if it isn't in memory yet"""
+    await data_loader.aget_data()
+
+
+api_router = APIRouter(dependencies=[Depends(ensure_data_loaded)])
 
 # Include all endpoint routers
 api_router.include_router(
@@ -0,0 +1,57 @@
+"""
+NDJSON streaming for the row-heavy endpoints
+"""
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic_core import to_json
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# OpenAPI entry for endpoints that can also answer in NDJSON
+NDJSON_CONTENT = {NDJSON_MEDIA_TYPE: {"schema": {"type": "string"}}}
+
+# Both representations share a URL, so shared caches must key on Accept
+VARY_ACCEPT = {"Vary": "Accept"}
+
+
+def wants_ndjson(request: Request) -> bool:
+    """True when the client asked for NDJSON via the Accept header"""
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def record(record_type: str, data: Any) -> Dict[str, Any]:
+    """Tag a row so clients can tell the record types in one stream apart"""
+    return {"type": record_type, "data": data}
+
+
+def ndjson_response(rows: Iterable[Any], batch_size: int = 64,
+                    headers: Optional[Dict[str, str]] = None) -> StreamingResponse:
+    """
+    Stream rows as newline-delimited JSON
+    
+    Each row (a dict or pydantic model) is serialized by pydantic-core on its
+    own line, so the client can render the first rows before the last are
+    written. Lines are sent in batches to keep the number of chunks (and
+    gzip flushes) small.
+    
+    Args:
+        rows: Rows to serialize, one JSON document per line
+        batch_size: Number of lines per chunk
+        headers: Extra response headers
+    
+    Returns:
+        StreamingResponse with media type application/x-ndjson
+    """
+    async def body() -> AsyncIterator[bytes]:
+        batch = []
+        for row in rows:
+            batch.append(to_json(row, exclude_none=True))
+            if len(batch) >= batch_size:
+                yield b"\n".join(batch) + b"\n"
+                batch = []
+        if batch:
+            yield b"\n".join(batch) + b"\n"
+    
+    return StreamingResponse(body(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -6,6 +6,7 @@ Business Intelligence Analyst | Data Science | AI | Clinical Research
 GitHub: github.com/michaeltheanalyst
 """
 import os
+import tempfile
 from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings
@@ -40,15 +41,29 @@ class Settings(BaseSettings):
         Path(__file__).parent.parent,
         "financial_fraud_detection_dataset.csv"
     )
+    # Where the preprocessed Arrow IPC file memory-mapped by every worker lives (tmpfs when available)
+    SHARED_DATA_DIR: str = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
     
     # Cache Configuration
     CACHE_ENABLED: bool = True
     CACHE_TTL: int = 300  # 5 minutes
     
+    # Seed for the simulated noise in fraud_probability (and synthetic data),
+    # so every load and every worker derives identical values
+    RANDOM_SEED: int = int(os.getenv("FRAUD_SEED", "42"))
+    # Add a random term (up to +0.08) to fraud_probability, for demo variety only
+    DEMO_NOISE: bool = os.getenv("FRAUD_DEMO_NOISE", "False").lower() == "true"
+    
     # Processing Configuration
     CHUNK_SIZE: int = 100000  # For chunked CSV reading
     MAX_WORKERS: int = 4  # For parallel processing
     
+    # Server Configuration (uvicorn inside each gunicorn worker, see backend/worker.py)
+    LIMIT_CONCURRENCY: int = int(os.getenv("LIMIT_CONCURRENCY", "1000"))  # 503 beyond this many open connections
+    KEEP_ALIVE_TIMEOUT: int = int(os.getenv("KEEP_ALIVE_TIMEOUT", "30"))  # Seconds
+    # Per-request log line from the timing middleware (uvicorn's own access log is off)
+    ACCESS_LOG: bool = os.getenv("ACCESS_LOG", "True").lower() == "true"
+    
     # Real-time Configuration
     HIGH_RISK_THRESHOLD: float = 0.75  # 75% probability
     FRAUD_VELOCITY_WINDOW: int = 3600  # 1 hour in seconds
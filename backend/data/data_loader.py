@@ -1,17 +1,102 @@
 """
 Data loading and caching layer for efficient CSV operations
 """
+import os
+import asyncio
+import threading
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, Any, List
+import duckdb
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+import pyarrow.parquet as pq
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 from functools import lru_cache
+from contextlib import contextmanager
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows - no cross-process locking, writes stay atomic
+    fcntl = None
+
 from backend.config import settings
+from backend.data import kernels
 
 logger = logging.getLogger(__name__)
 
+# Upper bounds of the low/medium/high risk bands (critical above the last).
+# float32 like fraud_probability, so band edges agree with threshold comparisons on it
+RISK_BOUNDS = np.array([0.3, 0.6, 0.75], dtype=np.float32)
+RISK_LABELS = ['low', 'medium', 'high', 'critical']
+
+# Lowest threshold served from the precomputed high-risk view
+HIGH_RISK_FLOOR = 0.5
+
+# Probability above which a not-yet-confirmed transaction counts as fraud prevented
+PREVENTION_THRESHOLD = 0.8
+
+# Version of the _preprocess_data output - bump whenever the derived columns change
+# so shared snapshots built by older code are rebuilt instead of reused
+PREPROCESS_VERSION = 3
+
+HOUR_NS = 3_600_000_000_000
+DAY_NS = 24 * HOUR_NS
+
+# Optimized dtypes for memory efficiency. 'string' is Arrow-backed (no per-row Python
+# objects); 'category' only where values repeat, since near-unique columns such as
+# transaction_id and ip_address would grow with a dictionary on top of their strings
+DTYPE_SPEC = {
+    'transaction_id': 'string',
+    'sender_account': 'string',
+    'receiver_account': 'string',
+    'transaction_type': 'category',
+    'merchant_category': 'category',
+    'location': 'category',
+    'device_used': 'category',
+    'is_fraud': 'bool',
+    'fraud_type': 'category',  # A handful of types, missing for legitimate rows
+    'payment_channel': 'category',
+    'ip_address': 'string',
+    'device_hash': 'category',  # Devices repeat across transactions
+    'amount': 'float32',
+    'time_since_last_transaction': 'float32',
+    'spending_deviation_score': 'float32',
+    'velocity_score': 'float32',
+    'geo_anomaly_score': 'float32'
+}
+
+# Arrow equivalents of DTYPE_SPEC for parsing the CSV without pandas
+ARROW_TYPES = {'string': pa.large_string(), 'category': pa.dictionary(pa.int32(), pa.string()),
+               'bool': pa.bool_(), 'float32': pa.float32()}
+CSV_COLUMN_TYPES = {col: ARROW_TYPES[dtype] for col, dtype in DTYPE_SPEC.items()}
+CSV_COLUMN_TYPES['timestamp'] = pa.timestamp('us')
+
+# Pandas schema metadata for the converted table, so to_pandas() restores DTYPE_SPEC
+# (category/string extension dtypes) exactly as a pandas read would produce them
+PANDAS_METADATA = pa.Schema.from_pandas(
+    pd.DataFrame({col: pd.Series(dtype=dtype) for col, dtype in DTYPE_SPEC.items()}),
+    preserve_index=False
+).metadata
+
+
+@contextmanager
+def _file_lock(lock_path: Path):
+    """Hold an exclusive advisory lock on lock_path (shared across worker processes)"""
+    if fcntl is None:
+        yield
+        return
+    
+    with open(lock_path, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
 
 class DataLoader:
     """Singleton class for loading and caching fraud detection data"""
@@ -19,15 +104,90 @@ class DataLoader:
     _instance = None
     _data: Optional[pd.DataFrame] = None
     _loaded_at: Optional[datetime] = None
+    version: int = 0  # Bumped on every (re)load; used to invalidate derived caches
+    
+    _duck: Optional[duckdb.DuckDBPyConnection] = None
+    _arrow: Optional[pa.Table] = None
+    _ts_ns: Optional[np.ndarray] = None
+    _fraud_view: Optional[pd.DataFrame] = None
+    _high_risk_sorted: Optional[pd.DataFrame] = None
+    _hourly: Optional[pd.DataFrame] = None
+    _fraud_type_totals: Optional[pd.DataFrame] = None
+    _account_ids: Optional[np.ndarray] = None
+    _sender_codes: Optional[np.ndarray] = None
+    _receiver_codes: Optional[np.ndarray] = None
+    _location_codes: Optional[np.ndarray] = None
+    _transaction_index: Optional[pd.Index] = None
+    _stats: Optional[Dict[str, Any]] = None
+    # Created on first use, on the loop that awaits it: on Python 3.9 an asyncio.Lock
+    # made at import time binds to a different loop than the server's
+    _async_lock: Optional[asyncio.Lock] = None
+    _async_lock_loop: Optional[asyncio.AbstractEventLoop] = None
+    _lock: threading.Lock = threading.Lock()  # Serializes construction and (re)loads across threads
     
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(DataLoader, cls).__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    instance = super(DataLoader, cls).__new__(cls)
+                    instance._duck = duckdb.connect(':memory:')
+                    cls._instance = instance
         return cls._instance
     
+    @property
+    def _parquet_path(self) -> Path:
+        """Columnar copy of the CSV dataset (same name, .parquet suffix)"""
+        return Path(settings.DATA_FILE_PATH).with_suffix('.parquet')
+    
+    def ensure_parquet(self) -> Path:
+        """
+        Convert the CSV dataset to Parquet once so later loads skip text parsing
+        
+        The Parquet file is rebuilt whenever the CSV is newer than it.
+        
+        Returns:
+            Path to the Parquet file
+        """
+        csv_path = Path(settings.DATA_FILE_PATH)
+        parquet_path = self._parquet_path
+        
+        if parquet_path.exists() and parquet_path.stat().st_mtime >= csv_path.stat().st_mtime:
+            return parquet_path
+        
+        logger.info(f"Converting {csv_path.name} to Parquet (one-time)")
+        try:
+            # Multithreaded typed parse straight into Arrow (timestamps included)
+            table = pv.read_csv(
+                csv_path,
+                convert_options=pv.ConvertOptions(column_types=CSV_COLUMN_TYPES, strings_can_be_null=True)
+            )
+            table = table.replace_schema_metadata(PANDAS_METADATA)
+        except pa.ArrowInvalid as e:
+            # Malformed values (e.g. unparseable timestamps) - pandas coerces them to NaT.
+            # The pyarrow engine keeps the parse multithreaded; a timestamp column it
+            # can't infer stays text and is coerced below.
+            logger.warning(f"Typed CSV parse failed ({e}); falling back to pandas")
+            df = pd.read_csv(csv_path, dtype=DTYPE_SPEC, engine='pyarrow')
+            df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            del df
+        
+        # Write to a temporary file first so concurrent readers never see a partial file
+        tmp_path = parquet_path.with_suffix('.parquet.tmp')
+        pq.write_table(table, tmp_path, compression='zstd', use_dictionary=True, row_group_size=256_000)
+        os.replace(tmp_path, parquet_path)
+        
+        logger.info(f"Parquet file written to {parquet_path}")
+        return parquet_path
+    
     def load_data(self, force_reload: bool = False) -> pd.DataFrame:
         """
-        Load data from CSV with caching
+        Load data from the shared preprocessed copy of the CSV with caching
+        
+        Safe to call from several threads at once: one caller loads while the
+        others wait and then return its result, so the data is never read (and
+        held in memory) twice. Callers that were waiting behind another forced
+        reload don't reload again either.
         
         Args:
             force_reload: Force reload from disk
@@ -36,66 +196,190 @@ class DataLoader:
             DataFrame with all transaction data
         """
         if self._data is not None and not force_reload:
-            logger.info("Returning cached data")
             return self._data
         
+        seen_version = self.version
+        with self._lock:
+            if self._data is not None and (not force_reload or self.version != seen_version):
+                logger.info("Returning cached data")
+                return self._data
+            return self._load_locked(force_reload)
+    
+    def _load_locked(self, force_reload: bool) -> pd.DataFrame:
+        """Body of load_data(); the caller holds _lock"""
         logger.info(f"Loading data from {settings.DATA_FILE_PATH}")
         
         try:
-            import os
-            from pathlib import Path
-            
             # Check if file exists
             data_path = Path(settings.DATA_FILE_PATH)
+            table = None
             if not data_path.exists():
                 logger.warning(f"Data file not found at {settings.DATA_FILE_PATH}. Generating synthetic data for demo.")
-                self._data = self._generate_synthetic_data()
-                self._loaded_at = datetime.now()
-                logger.info(f"Synthetic data generated: {len(self._data):,} rows")
-                return self._data
-            
-            # Load with optimized dtypes for memory efficiency
-            dtype_spec = {
-                'transaction_id': 'string',
-                'sender_account': 'string',
-                'receiver_account': 'string',
-                'transaction_type': 'category',
-                'merchant_category': 'category',
-                'location': 'category',
-                'device_used': 'category',
-                'is_fraud': 'bool',
-                'fraud_type': 'string',
-                'payment_channel': 'category',
-                'ip_address': 'string',
-                'device_hash': 'string',
-                'amount': 'float32',
-                'time_since_last_transaction': 'float32',
-                'spending_deviation_score': 'float32',
-                'velocity_score': 'float32',
-                'geo_anomaly_score': 'float32'
-            }
-            
-            self._data = pd.read_csv(
-                settings.DATA_FILE_PATH,
-                dtype=dtype_spec
-            )
-            
-            # Convert timestamp to datetime explicitly
-            self._data['timestamp'] = pd.to_datetime(self._data['timestamp'], errors='coerce')
-            
-            # Data preprocessing
-            self._data = self._preprocess_data(self._data)
-            
-            self._loaded_at = datetime.now()
-            logger.info(f"Data loaded successfully: {len(self._data):,} rows")
-            
-            return self._data
+                df = self._generate_synthetic_data()
+                logger.info(f"Synthetic data generated: {len(df):,} rows")
+            else:
+                table = self._load_shared(rebuild=force_reload)
+                df = table.to_pandas(split_blocks=True)
+                logger.info(f"Data loaded successfully: {len(df):,} rows")
             
         except Exception as e:
             logger.error(f"Error loading data: {str(e)}. Generating synthetic data as fallback.")
-            self._data = self._generate_synthetic_data()
-            self._loaded_at = datetime.now()
-            return self._data
+            df = self._generate_synthetic_data()
+            table = None
+        
+        self._set_data(df, table)
+        return self._data
+    
+    def _load_shared(self, rebuild: bool = False) -> pa.Table:
+        """
+        Map the preprocessed dataset shared by all worker processes
+        
+        The first worker to take the lock converts and preprocesses the data
+        and writes it as an uncompressed Arrow IPC file in SHARED_DATA_DIR;
+        every worker then memory-maps that file, so the page cache holds one
+        copy of the data however many workers are running. The file is reused
+        across restarts until its key (source Parquet file, PREPROCESS_VERSION,
+        RANDOM_SEED and DEMO_NOISE) stops matching.
+        
+        Args:
+            rebuild: Rewrite the shared file even if it is up to date
+            
+        Returns:
+            Arrow table backed by the memory-mapped file
+        """
+        shared_path = Path(settings.SHARED_DATA_DIR) / f"{Path(settings.DATA_FILE_PATH).stem}.arrow"
+        
+        with _file_lock(shared_path.with_suffix('.lock')):
+            parquet_path = self.ensure_parquet()
+            key = self._snapshot_key(parquet_path)
+            if rebuild or self._read_snapshot_key(shared_path) != key:
+                logger.info(f"Building shared dataset at {shared_path}")
+                
+                # Columnar, typed read - no CSV parsing after the first conversion.
+                # Pandas dtypes (category/string/float32) are restored from the schema metadata.
+                table = pq.read_table(parquet_path, memory_map=True)
+                df = table.to_pandas(self_destruct=True, split_blocks=True)
+                del table
+                
+                # Sidecars written under an older DTYPE_SPEC are brought up to date here
+                stale = {col: dtype for col, dtype in DTYPE_SPEC.items() if col in df and df[col].dtype != dtype}
+                if stale:
+                    df = df.astype(stale)
+                
+                # Data preprocessing
+                df = self._preprocess_data(df)
+                
+                # Uncompressed, so readers map the column buffers without decoding them
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                table = table.replace_schema_metadata({**table.schema.metadata, b'snapshot_key': key})
+                tmp_path = shared_path.with_suffix('.arrow.tmp')
+                with pa.OSFile(str(tmp_path), 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(tmp_path, shared_path)
+                del df, table
+        
+        return pa.ipc.open_file(pa.memory_map(str(shared_path))).read_all()
+    
+    @staticmethod
+    def _snapshot_key(parquet_path: Path) -> bytes:
+        """Identity of a shared snapshot: source file version, preprocessing version, seed and noise"""
+        stat = parquet_path.stat()
+        return (f"{parquet_path.resolve()}:{stat.st_size}:{stat.st_mtime_ns}:"
+                f"v{PREPROCESS_VERSION}:seed{settings.RANDOM_SEED}:noise{int(settings.DEMO_NOISE)}").encode()
+    
+    @staticmethod
+    def _read_snapshot_key(shared_path: Path) -> Optional[bytes]:
+        """Key stored in a shared snapshot's schema metadata (None if missing or unreadable)"""
+        try:
+            with pa.memory_map(str(shared_path)) as source:
+                metadata = pa.ipc.open_file(source).schema.metadata or {}
+        except (OSError, pa.ArrowInvalid):
+            return None
+        return metadata.get(b'snapshot_key')
+    
+    def _set_data(self, df: pd.DataFrame, table: Optional[pa.Table] = None) -> None:
+        """
+        Install a freshly loaded DataFrame and rebuild the views derived from it
+        
+        Args:
+            df: Preprocessed DataFrame, sorted by timestamp
+            table: Arrow table df was converted from, reused for SQL queries
+        """
+        # Timestamps as int64 ns (NaT sorts first), for binary-search time slicing
+        self._ts_ns = df['timestamp'].to_numpy().view('i8')
+        
+        # Hot subsets materialized once instead of rescanned on every call
+        self._fraud_view = df[df['is_fraud'].to_numpy()]
+        self._high_risk_sorted = df[df['fraud_probability'].to_numpy() >= HIGH_RISK_FLOOR].sort_values(
+            'fraud_probability', ascending=False, kind='stable'
+        )
+        
+        # Small rollups the dashboard tiles are served from
+        self._hourly = self._hourly_rollup(df, self._ts_ns)
+        fraud_types = self._fraud_view['amount'].astype(np.float64).groupby(self._fraud_view['fraud_type'], observed=True)
+        # Categories are in file order; sort the labels first so equal counts stay alphabetical
+        self._fraud_type_totals = pd.DataFrame({
+            'count': fraud_types.size(),
+            'amount_sum': fraud_types.sum()
+        }).sort_index(key=lambda labels: labels.astype(str)).sort_values('count', ascending=False, kind='stable')
+        
+        # Integer account codes (ids sorted, so code order is id order) for graph work
+        n = len(df)
+        codes, account_ids = pd.factorize(
+            pd.concat([df['sender_account'], df['receiver_account']], ignore_index=True), sort=True
+        )
+        self._account_ids = np.asarray(account_ids, dtype=object)
+        self._sender_codes = codes[:n].astype(np.int32)
+        self._receiver_codes = codes[n:].astype(np.int32)
+        self._location_codes = pd.factorize(df['location'])[0].astype(np.int32)
+        
+        # Transaction id lookup; pandas builds the hash table on the first lookup
+        self._transaction_index = pd.Index(df['transaction_id'])
+        
+        # Whole-dataset figures, so per-request code doesn't rescan columns for them
+        rows = len(df)
+        first = int(np.searchsorted(self._ts_ns, np.iinfo(np.int64).min + 1))
+        fraud_count = len(self._fraud_view)
+        days = self._ts_ns[first:] // DAY_NS
+        num_days = int(np.count_nonzero(days[1:] != days[:-1])) + 1 if len(days) else 0
+        self._stats = {
+            'rows': rows,
+            'fraud_count': fraud_count,
+            'fraud_rate': fraud_count / rows if rows else 0.0,
+            'avg_daily_transactions': (rows - first) / max(num_days, 1),
+            'ts_min': pd.Timestamp(self._ts_ns[first]) if first < rows else pd.NaT,
+            'ts_max': pd.Timestamp(self._ts_ns[-1]) if first < rows else pd.NaT
+        }
+        
+        self._arrow = table
+        self._data = df
+        self._loaded_at = datetime.now()
+        self.version += 1
+    
+    async def aload(self, force_reload: bool = False) -> pd.DataFrame:
+        """
+        Load data without blocking the event loop
+        
+        The read runs in a worker thread; the lock makes concurrent callers
+        wait for a single load instead of each starting their own.
+        
+        Args:
+            force_reload: Force reload from disk
+            
+        Returns:
+            DataFrame with all transaction data
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_lock is None or self._async_lock_loop is not loop:
+            # No await between the check and the assignment, so callers on one loop share a lock
+            self._async_lock = asyncio.Lock()
+            self._async_lock_loop = loop
+        
+        async with self._async_lock:
+            if self._data is None or force_reload:
+                await asyncio.to_thread(self.load_data, force_reload)
+        return self._data
     
     def _preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -107,84 +391,123 @@ class DataLoader:
         Returns:
             Preprocessed DataFrame
         """
-        # Add derived columns
-        df['hour'] = df['timestamp'].dt.hour
-        df['day_of_week'] = df['timestamp'].dt.dayofweek
-        df['date'] = df['timestamp'].dt.date
-        df['is_weekend'] = df['day_of_week'].isin([5, 6])
-        df['is_night'] = df['hour'].between(0, 6)
+        # Keep rows in time order so time windows are contiguous slices
+        df['timestamp'] = df['timestamp'].astype('datetime64[ns]')
+        df = df.sort_values('timestamp', kind='stable', na_position='first', ignore_index=True)
+        
+        # Add derived columns - integer math on the ns timestamps (-1 where NaT)
+        ts_ns = df['timestamp'].to_numpy().view(np.int64)
+        valid = ~np.isnat(df['timestamp'].to_numpy())
+        days = ts_ns // DAY_NS
+        hour = ((ts_ns // HOUR_NS) % 24).astype(np.int8)
+        day_of_week = ((days + 3) % 7).astype(np.int8)  # 1970-01-01 was a Thursday (Monday=0)
+        hour[~valid] = -1
+        day_of_week[~valid] = -1
+        df['hour'] = hour
+        df['day_of_week'] = day_of_week
+        df['date'] = np.where(valid, days * DAY_NS, ts_ns).view('datetime64[ns]')  # Midnight of each day
+        df['is_weekend'] = day_of_week >= 5
+        df['is_night'] = (hour >= 0) & (hour <= 6)
         
         # Calculate fraud probability (simulated from behavioral features)
-        df['fraud_probability'] = (
-            df['velocity_score'] * 0.34 +
-            df['geo_anomaly_score'] * 0.28 +
-            df['spending_deviation_score'] * 0.19 +
-            (df['time_since_last_transaction'] < 60).astype(float) * 0.11 +
-            np.random.uniform(0, 0.08, len(df))  # Random factor
-        ).clip(0, 1)
-        
-        # Risk categories
-        df['risk_category'] = pd.cut(
-            df['fraud_probability'],
-            bins=[0, 0.3, 0.6, 0.75, 1.0],
-            labels=['low', 'medium', 'high', 'critical']
+        # Optional random factor - fresh PCG64 stream per load, so reloads reproduce the same values
+        noise = None
+        if settings.DEMO_NOISE:
+            noise = np.random.default_rng(settings.RANDOM_SEED).random(len(df), dtype=np.float32)
+        fraud_probability = kernels.fraud_probability(
+            df['velocity_score'].to_numpy(dtype=np.float32),
+            df['geo_anomaly_score'].to_numpy(dtype=np.float32),
+            df['spending_deviation_score'].to_numpy(dtype=np.float32),
+            df['time_since_last_transaction'].to_numpy(dtype=np.float32),
+            noise
         )
         
+        df['fraud_probability'] = fraud_probability
+        
+        # Risk categories - right-closed bands like pd.cut: a value's band is the
+        # number of bounds it exceeds (branchless vector compares, no binary search)
+        codes = np.zeros(len(df), dtype=np.int8)
+        above = np.empty(len(df), dtype=bool)
+        for bound in RISK_BOUNDS:
+            np.greater(fraud_probability, bound, out=above)
+            codes += above.view(np.int8)
+        codes[np.isnan(fraud_probability)] = -1
+        df['risk_category'] = pd.Categorical.from_codes(codes, categories=RISK_LABELS, ordered=True)
+        
         return df
     
     def _generate_synthetic_data(self, num_rows: int = 100000) -> pd.DataFrame:
         """
         Generate synthetic fraud detection data for demo purposes
+        
+        Columns are built directly as Arrow arrays with the DTYPE_SPEC types, so
+        the frame gets the same dtypes as real data and no fixed-width NumPy
+        string arrays or per-row Python strings are created.
         """
         logger.info("Generating synthetic fraud detection data...")
         
-        np.random.seed(42)  # For reproducibility
+        np.random.seed(settings.RANDOM_SEED)  # For reproducibility
         
         # Generate timestamps (last 30 days)
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30)
         timestamps = pd.date_range(start=start_date, end=end_date, periods=num_rows)
         
-        # Generate transaction IDs
-        transaction_ids = [f"T{i:06d}" for i in range(1, num_rows + 1)]
-        
         # Generate accounts
         num_accounts = num_rows // 10
-        accounts = [f"ACC{i:05d}" for i in range(1, num_accounts + 1)]
+        accounts = pc.binary_join_element_wise("ACC", self._zero_padded(np.arange(1, num_accounts + 1), 5), "")
         
-        # Generate synthetic data
+        # Generate synthetic data (draws in a fixed order, so a seed always gives the same data)
         data = {
-            'transaction_id': transaction_ids,
-            'sender_account': np.random.choice(accounts, num_rows),
-            'receiver_account': np.random.choice(accounts, num_rows),
-            'transaction_type': np.random.choice(['transfer', 'payment', 'withdrawal', 'deposit'], num_rows),
-            'merchant_category': np.random.choice(['retail', 'online', 'grocery', 'gas', 'restaurant', 'entertainment'], num_rows),
-            'location': np.random.choice(['US', 'UK', 'CA', 'AU', 'DE', 'FR', 'IT', 'ES'], num_rows),
-            'device_used': np.random.choice(['mobile', 'desktop', 'tablet'], num_rows),
-            'payment_channel': np.random.choice(['card', 'bank_transfer', 'digital_wallet'], num_rows),
-            'ip_address': [f"{np.random.randint(1,255)}.{np.random.randint(1,255)}.{np.random.randint(1,255)}.{np.random.randint(1,255)}" for _ in range(num_rows)],
-            'device_hash': [f"DEV{np.random.randint(100000,999999)}" for _ in range(num_rows)],
+            'transaction_id': pc.binary_join_element_wise("T", self._zero_padded(np.arange(1, num_rows + 1), 6), ""),
+            'sender_account': accounts.take(np.random.choice(num_accounts, num_rows)),
+            'receiver_account': accounts.take(np.random.choice(num_accounts, num_rows)),
+            'transaction_type': self._random_category(['transfer', 'payment', 'withdrawal', 'deposit'], num_rows),
+            'merchant_category': self._random_category(['retail', 'online', 'grocery', 'gas', 'restaurant', 'entertainment'], num_rows),
+            'location': self._random_category(['US', 'UK', 'CA', 'AU', 'DE', 'FR', 'IT', 'ES'], num_rows),
+            'device_used': self._random_category(['mobile', 'desktop', 'tablet'], num_rows),
+            'payment_channel': self._random_category(['card', 'bank_transfer', 'digital_wallet'], num_rows),
+            'ip_address': self._random_ips(num_rows),
+            'device_hash': pc.binary_join_element_wise(
+                "DEV", pa.array(np.random.randint(100000, 999999, num_rows)).cast(pa.string()), ""
+            ),
             'amount': np.random.lognormal(mean=4.5, sigma=1.2, size=num_rows).round(2),
             'time_since_last_transaction': np.random.exponential(scale=3600, size=num_rows).round(2),
             'spending_deviation_score': np.random.beta(2, 5, num_rows).round(3),
             'velocity_score': np.random.beta(2, 5, num_rows).round(3),
             'geo_anomaly_score': np.random.beta(2, 5, num_rows).round(3),
-            'timestamp': timestamps,
+            'timestamp': timestamps.to_numpy(),
         }
         
-        df = pd.DataFrame(data)
-        
         # Generate fraud labels (3.5% fraud rate)
         fraud_rate = 0.035
         num_fraud = int(num_rows * fraud_rate)
         fraud_indices = np.random.choice(num_rows, num_fraud, replace=False)
-        df['is_fraud'] = False
-        df.loc[fraud_indices, 'is_fraud'] = True
+        is_fraud = np.zeros(num_rows, dtype=bool)
+        is_fraud[fraud_indices] = True
+        data['is_fraud'] = is_fraud
         
-        # Assign fraud types
-        fraud_types = ['identity_theft', 'card_fraud', 'account_takeover', 'money_laundering', 'phishing']
-        df['fraud_type'] = ''
-        df.loc[fraud_indices, 'fraud_type'] = np.random.choice(fraud_types, num_fraud)
+        # Assign fraud types (empty string for legitimate transactions)
+        fraud_types = pa.array(['', 'identity_theft', 'card_fraud', 'account_takeover', 'money_laundering', 'phishing'])
+        type_codes = np.zeros(num_rows, dtype=np.int64)
+        type_codes[fraud_indices] = np.random.choice(len(fraud_types) - 1, num_fraud) + 1
+        data['fraud_type'] = fraud_types.take(type_codes)
+        
+        # Cast to the DTYPE_SPEC types, then one Arrow -> pandas conversion
+        # (a block per column, each Arrow buffer freed as it is converted)
+        columns = {}
+        for col, values in data.items():
+            arrow_type = ARROW_TYPES[DTYPE_SPEC[col]] if col in DTYPE_SPEC else None
+            if isinstance(values, np.ndarray):
+                columns[col] = pa.array(values, type=arrow_type)
+            elif arrow_type is not None and values.type != arrow_type:
+                columns[col] = values.dictionary_encode() if pa.types.is_dictionary(arrow_type) else values.cast(arrow_type)
+            else:
+                columns[col] = values
+        table = pa.table(columns).replace_schema_metadata(PANDAS_METADATA)
+        del data, columns
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+        del table
         
         # Preprocess the synthetic data
         df = self._preprocess_data(df)
@@ -192,28 +515,317 @@ class DataLoader:
         logger.info(f"Synthetic data generated: {len(df):,} rows, {num_fraud:,} fraud cases ({fraud_rate*100:.2f}%)")
         return df
     
+    @staticmethod
+    def _zero_padded(numbers: np.ndarray, width: int) -> pa.Array:
+        """Integers as zero-padded decimal strings"""
+        return pc.utf8_lpad(pa.array(numbers).cast(pa.string()), width=width, padding="0")
+    
+    @staticmethod
+    def _random_category(options: List[str], num_rows: int) -> pa.DictionaryArray:
+        """
+        Uniform draws from options as a dictionary array with sorted categories
+        
+        Consumes the random stream exactly like ``np.random.choice(options, num_rows)``.
+        """
+        labels = np.array(options)
+        order = np.argsort(labels)
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order), dtype=np.int32)
+        codes = rank[np.random.choice(len(labels), num_rows)]
+        return pa.DictionaryArray.from_arrays(codes, pa.array(labels[order], type=pa.string()))
+    
+    @staticmethod
+    def _random_ips(num_rows: int) -> pa.Array:
+        """Random dotted-quad IPv4 strings (octets 1-254), one row of draws per address"""
+        octets = np.random.randint(1, 255, size=(num_rows, 4))
+        parts = [pa.array(octets[:, i]).cast(pa.string()) for i in range(4)]
+        return pc.binary_join_element_wise(*parts, ".")
+    
     def get_data(self) -> pd.DataFrame:
         """Get cached data or load if not available"""
         if self._data is None:
             return self.load_data()
         return self._data
     
-    def get_recent_transactions(self, hours: int = 24) -> pd.DataFrame:
-        """Get transactions from the last N hours"""
+    async def aget_data(self) -> pd.DataFrame:
+        """Async variant of get_data() for use on the event loop"""
+        if self._data is None:
+            return await self.aload()
+        return self._data
+    
+    def query(self, sql: str, params: Optional[List[Any]] = None) -> pa.Table:
+        """
+        Run a vectorized SQL aggregation over the loaded data
+        
+        The preprocessed DataFrame is exposed to DuckDB as the table ``tx``
+        through an Arrow snapshot (built once per load, then scanned
+        zero-copy), so aggregations run in DuckDB's columnar engine instead
+        of Pandas groupby.
+        
+        Args:
+            sql: SQL statement referencing the ``tx`` table
+            params: Positional parameters for ``?`` placeholders
+            
+        Returns:
+            Arrow table with the query result
+        """
+        if self._arrow is None:
+            self._arrow = pa.Table.from_pandas(self.get_data(), preserve_index=False)
+        
+        # Each cursor is an independent connection, safe to use from worker threads
+        cursor = self._duck.cursor()
+        try:
+            cursor.register('tx', self._arrow)
+            return cursor.execute(sql, params or []).to_arrow_table()
+        finally:
+            cursor.close()
+    
+    def get_columns(self, cols: Optional[List[str]] = None, ts_from=None, ts_to=None) -> pd.DataFrame:
+        """
+        Get a column subset of the transactions in [ts_from, ts_to)
+        
+        Rows are kept sorted by timestamp, so the time range is a binary
+        search and a positional slice, and the projection is copy-on-write,
+        so neither touches the columns a caller doesn't ask for.
+        
+        Args:
+            cols: Columns to return (all columns if None)
+            ts_from: Earliest timestamp to include
+            ts_to: Timestamp to stop before
+            
+        Returns:
+            DataFrame slice with the requested columns
+        """
         df = self.get_data()
-        cutoff = df['timestamp'].max() - timedelta(hours=hours)
-        return df[df['timestamp'] >= cutoff]
+        start, stop = self.get_row_range(ts_from, ts_to)
+        subset = df.iloc[start:stop]
+        return subset[cols] if cols is not None else subset
     
-    def get_high_risk_transactions(self, threshold: float = 0.75, limit: int = 100) -> pd.DataFrame:
-        """Get high-risk transactions above threshold"""
+    def get_row_range(self, ts_from=None, ts_to=None) -> Tuple[int, int]:
+        """
+        Positions [start, stop) of the transactions in [ts_from, ts_to)
+        
+        The rows get_columns returns for the same bounds; use it to slice
+        other row-aligned arrays (e.g. get_account_codes) to that window.
+        
+        Args:
+            ts_from: Earliest timestamp to include
+            ts_to: Timestamp to stop before
+            
+        Returns:
+            Tuple of (start, stop) row positions
+        """
         df = self.get_data()
-        high_risk = df[df['fraud_probability'] >= threshold].copy()
-        return high_risk.nlargest(limit, 'fraud_probability')
+        if ts_from is None and ts_to is None:
+            return 0, len(df)
+        
+        # Like a boolean filter, any time bound drops NaT rows (sorted first)
+        nat = np.iinfo(np.int64).min
+        start_ns = pd.Timestamp(ts_from).as_unit('ns').value if ts_from is not None else nat + 1
+        stop_ns = pd.Timestamp(ts_to).as_unit('ns').value if ts_to is not None else np.iinfo(np.int64).max
+        start, stop = np.searchsorted(self._ts_ns, [start_ns, stop_ns], side='left')
+        return int(start), int(stop) if ts_to is not None else len(df)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Whole-dataset figures computed once per load
+        
+        Returns:
+            Dictionary with rows, fraud_count, fraud_rate, avg_daily_transactions
+            (over the dates present), ts_min and ts_max (NaT when no row has a
+            timestamp)
+        """
+        self.get_data()
+        return self._stats
+    
+    def get_latest_timestamp(self) -> pd.Timestamp:
+        """Timestamp of the newest transaction - the "now" all time windows count back from"""
+        return self.get_stats()['ts_max']
+    
+    def get_transactions_since(self, cutoff, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get transactions at or after a point in time (optionally only some columns)"""
+        return self.get_columns(columns, ts_from=cutoff)
+    
+    @staticmethod
+    def _hourly_rollup(df: pd.DataFrame, ts_ns: np.ndarray) -> pd.DataFrame:
+        """
+        Aggregate time-sorted rows into one row per clock hour
+        
+        Args:
+            df: Time-sorted transactions
+            ts_ns: Their timestamps as int64 nanoseconds
+            
+        Returns:
+            One row per hour with additive counts and sums (NaN-skipping)
+        """
+        # NaT sorts first; skip it
+        first = np.searchsorted(ts_ns, np.iinfo(np.int64).min, side='right')
+        buckets = ts_ns[first:] // HOUR_NS
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]]) if len(buckets) else np.array([], dtype=np.intp)
+        
+        is_fraud = df['is_fraud'].to_numpy()[first:]
+        # Missing amounts and velocity scores are skipped, as pandas sum/mean do
+        amount = df['amount'].to_numpy(dtype=np.float64)[first:]
+        has_amount = ~np.isnan(amount)
+        velocity = df['velocity_score'].to_numpy(dtype=np.float64)[first:]
+        has_velocity = ~np.isnan(velocity)
+        fraud_probability = df['fraud_probability'].to_numpy()[first:]
+        high_risk = fraud_probability >= settings.HIGH_RISK_THRESHOLD
+        prevented = (fraud_probability >= PREVENTION_THRESHOLD) & ~is_fraud
+        
+        def per_hour(values: np.ndarray) -> np.ndarray:
+            return np.add.reduceat(values, starts) if len(starts) else values[:0]
+        
+        return pd.DataFrame({
+            'bucket': (buckets[starts] * HOUR_NS).view('datetime64[ns]'),
+            'hour': (buckets[starts] % 24).astype(np.int32),
+            'transaction_count': np.diff(np.r_[starts, len(buckets)]).astype(np.int64),
+            'fraud_count': per_hour(is_fraud.astype(np.int64)),
+            'fraud_amount': per_hour(np.where(is_fraud & has_amount, amount, 0.0)),
+            'high_risk_count': per_hour(high_risk.astype(np.int64)),
+            'high_risk_amount': per_hour(np.where(high_risk & has_amount, amount, 0.0)),
+            'prevented_amount': per_hour(np.where(prevented & has_amount, amount, 0.0)),
+            'velocity_sum': per_hour(np.where(has_velocity, velocity, 0.0)),
+            'velocity_count': per_hour(has_velocity.astype(np.int64))
+        })
     
-    def get_fraud_transactions(self) -> pd.DataFrame:
-        """Get all fraudulent transactions"""
+    def _rollup_raw(self, start_ns: int, end_ns: int) -> pd.DataFrame:
+        """Hourly aggregates of the raw rows in [start_ns, end_ns)"""
+        i, j = np.searchsorted(self._ts_ns, [start_ns, end_ns], side='left')
+        return self._hourly_rollup(self._data.iloc[i:j], self._ts_ns[i:j])
+    
+    def get_hourly_rollup(self, start, end=None) -> pd.DataFrame:
+        """
+        Get hourly aggregates covering exactly [start, end)
+        
+        Whole hours come from the rollup built at load time; the partial
+        hours at either edge of the window are aggregated from the raw rows,
+        so results match a scan of the full data.
+        
+        Args:
+            start: Window start (inclusive)
+            end: Window end (exclusive); open-ended if None
+            
+        Returns:
+            DataFrame with one row per hour (see _hourly_rollup)
+        """
+        self.get_data()
+        start_ns = pd.Timestamp(start).as_unit('ns').value
+        end_ns = pd.Timestamp(end).as_unit('ns').value if end is not None else np.iinfo(np.int64).max
+        
+        first_full = -(-start_ns // HOUR_NS) * HOUR_NS
+        last_full = end_ns // HOUR_NS * HOUR_NS if end is not None else end_ns
+        if first_full >= last_full:
+            return self._rollup_raw(start_ns, end_ns)
+        
+        bucket_ns = self._hourly['bucket'].to_numpy().view('i8')
+        i, j = np.searchsorted(bucket_ns, [first_full, last_full], side='left')
+        parts = [self._rollup_raw(start_ns, first_full), self._hourly.iloc[i:j]]
+        if end is not None:
+            parts.append(self._rollup_raw(last_full, end_ns))
+        
+        return pd.concat(parts, ignore_index=True)
+    
+    def get_fraud_type_totals(self) -> pd.DataFrame:
+        """Get per-fraud-type count and amount sum, most frequent first"""
+        self.get_data()
+        return self._fraud_type_totals
+    
+    def get_recent_transactions(self, hours: int = 24, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get transactions from the last N hours (optionally only some columns)"""
+        cutoff = self.get_latest_timestamp() - timedelta(hours=hours)
+        return self.get_transactions_since(cutoff, columns)
+    
+    def get_high_risk_transactions(self, threshold: float = 0.75, limit: int = 100,
+                                   columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get high-risk transactions above threshold (optionally only some columns)"""
+        df = self.get_data()
+        if threshold < HIGH_RISK_FLOOR:
+            top = self.top_rows(df, 'fraud_probability', limit, threshold)
+        else:
+            ranked = self._high_risk_sorted
+            top = ranked[ranked['fraud_probability'].to_numpy() >= threshold].head(limit)
+        return top[columns] if columns is not None else top
+    
+    @staticmethod
+    def top_rows(df: pd.DataFrame, column: str, limit: int, threshold: float) -> pd.DataFrame:
+        """
+        Rows with the largest values of a column at or above a threshold
+        
+        Same result as ``df[df[column] >= threshold].nlargest(limit, column)``
+        (ties resolved in row order), but the selection runs on the bare
+        column with an O(n) partition and only the winning rows are copied.
+        
+        Args:
+            df: Frame to select from
+            column: Numeric column to rank by
+            limit: Maximum number of rows
+            threshold: Minimum value (inclusive)
+            
+        Returns:
+            Up to ``limit`` rows of df, largest values first
+        """
+        values = df[column].to_numpy()
+        candidates = np.flatnonzero(values >= threshold)
+        scores = values[candidates]
+        
+        if len(candidates) > limit:
+            # Everything above the limit-th largest value, then its ties in row order
+            kth = np.partition(scores, len(scores) - limit)[len(scores) - limit] if limit > 0 else np.inf
+            keep = np.flatnonzero(scores > kth)
+            ties = np.flatnonzero(scores == kth)[:limit - len(keep)]
+            keep = np.sort(np.concatenate([keep, ties]))
+            candidates, scores = candidates[keep], scores[keep]
+        
+        order = np.argsort(-scores, kind='stable')
+        return df.iloc[candidates[order]]
+    
+    def get_account_codes(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the transaction graph as integer-coded edges
+        
+        Returns:
+            Tuple of (account_ids, sender_codes, receiver_codes): account_ids[code]
+            is the account id, and the code arrays are int32 and row-aligned with
+            the data (-1 where the account is missing)
+        """
+        self.get_data()
+        return self._account_ids, self._sender_codes, self._receiver_codes
+    
+    def get_transaction(self, transaction_id: str) -> Optional[pd.Series]:
+        """
+        Look up a single transaction by id (a hash probe, not a column scan)
+        
+        Args:
+            transaction_id: Transaction to find
+        
+        Returns:
+            The transaction's row (the first one if the id repeats), or None
+        """
         df = self.get_data()
-        return df[df['is_fraud'] == True]
+        try:
+            loc = self._transaction_index.get_loc(transaction_id)
+        except KeyError:
+            return None
+        if not isinstance(loc, (int, np.integer)):
+            # Repeated id: get_loc returns a slice or a boolean mask
+            loc = np.arange(len(df))[loc][0]
+        return df.iloc[loc]
+    
+    def get_timestamps_ns(self) -> np.ndarray:
+        """Timestamps as int64 nanoseconds, row-aligned and ascending (NaT first)"""
+        self.get_data()
+        return self._ts_ns
+    
+    def get_location_codes(self) -> np.ndarray:
+        """Integer location codes (int32), row-aligned with the data (-1 where missing)"""
+        self.get_data()
+        return self._location_codes
+    
+    def get_fraud_transactions(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get all fraudulent transactions (optionally only some columns)"""
+        self.get_data()
+        return self._fraud_view[columns] if columns is not None else self._fraud_view
     
     @property
     def data_info(self) -> Dict[str, Any]:
@@ -221,31 +833,18 @@ class DataLoader:
         if self._data is None:
             return {"loaded": False}
         
-        try:
-            min_date = self._data['timestamp'].min()
-            max_date = self._data['timestamp'].max()
-            
-            return {
-                "loaded": True,
-                "rows": len(self._data),
-                "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
-                "date_range": {
-                    "start": min_date.isoformat() if pd.notna(min_date) else None,
-                    "end": max_date.isoformat() if pd.notna(max_date) else None
-                },
-                "fraud_count": int(self._data['is_fraud'].sum()),
-                "fraud_rate": float(self._data['is_fraud'].mean())
-            }
-        except Exception as e:
-            logger.error(f"Error getting data info: {str(e)}")
-            return {
-                "loaded": True,
-                "rows": len(self._data),
-                "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
-                "fraud_count": int(self._data['is_fraud'].sum()),
-                "fraud_rate": float(self._data['is_fraud'].mean())
-            }
-
+        stats = self._stats
+        return {
+            "loaded": True,
+            "rows": stats['rows'],
+            "loaded_at": self._loaded_at.isoformat() if self._loaded_at else None,
+            "date_range": {
+                "start": stats['ts_min'].isoformat() if pd.notna(stats['ts_min']) else None,
+                "end": stats['ts_max'].isoformat() if pd.notna(stats['ts_max']) else None
+            },
+            "fraud_count": stats['fraud_count'],
+            "fraud_rate": stats['fraud_rate']
+        }
 
 # Global instance
 data_loader = DataLoader()
@@ -0,0 +1,281 @@
+"""
+Per-row numeric kernels used during preprocessing and by the services
+
+Numba is optional: when it is installed the kernels are JIT-compiled to a
+single fused loop over the raw float32 arrays, otherwise an equivalent NumPy
+implementation is used. Both evaluate in the same float32 order, so they
+produce bit-identical results.
+"""
+import numpy as np
+from typing import Optional, Tuple
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Fraud-probability feature weights
+W_VELOCITY = np.float32(0.34)
+W_GEO = np.float32(0.28)
+W_SPENDING = np.float32(0.19)
+W_RAPID = np.float32(0.11)  # Applied when time since last transaction < 60s
+W_NOISE = np.float32(0.08)
+
+# Impossible travel: a location change within this many nanoseconds (2 hours)
+TRAVEL_WINDOW_NS = 120 * 60 * 1_000_000_000
+NAT_NS = np.iinfo(np.int64).min
+
+
+def _fraud_probability_numpy(velocity: np.ndarray, geo: np.ndarray, spending: np.ndarray,
+                             time_since_last: np.ndarray, noise: Optional[np.ndarray]) -> np.ndarray:
+    """NumPy fallback: accumulated in place in one float32 buffer"""
+    out = np.empty(len(velocity), dtype=np.float32)
+    scratch = np.empty(len(velocity), dtype=np.float32)
+    
+    np.multiply(velocity, W_VELOCITY, out=out)
+    np.multiply(geo, W_GEO, out=scratch)
+    out += scratch
+    np.multiply(spending, W_SPENDING, out=scratch)
+    out += scratch
+    np.multiply(time_since_last < 60, W_RAPID, out=scratch)
+    out += scratch
+    if noise is not None:
+        np.multiply(noise, W_NOISE, out=scratch)
+        out += scratch
+    np.clip(out, 0, 1, out=out)
+    
+    return out
+
+
+def _impossible_travel_numpy(sender_codes: np.ndarray, ts_ns: np.ndarray, location_codes: np.ndarray,
+                             num_accounts: int) -> int:
+    """NumPy fallback: one stable sort by account, then compare consecutive rows"""
+    # Rows are time-sorted with NaT first, and NaT rows never count; drop them
+    first = int(np.searchsorted(ts_ns, NAT_NS, side='right'))
+    sender = sender_codes[first:]
+    order = np.argsort(sender, kind='stable')
+    sender = sender[order]
+    ts = ts_ns[first:][order]
+    location = location_codes[first:][order]
+    
+    same_account = (sender[1:] == sender[:-1]) & (sender[1:] >= 0)
+    moved = (location[1:] != location[:-1]) | (location[1:] < 0)
+    time_diff = ts[1:] - ts[:-1]
+    
+    return int((same_account & moved & (time_diff > 0) & (time_diff < TRAVEL_WINDOW_NS)).sum())
+
+
+def _mean_std_numpy(values: np.ndarray) -> Tuple[float, float]:
+    """NumPy fallback: NaN-skipping mean and sample std, accumulated in float64"""
+    valid = values[~np.isnan(values)]
+    mean = float(valid.mean(dtype=np.float64)) if valid.size else np.nan
+    std = float(valid.std(dtype=np.float64, ddof=1)) if valid.size > 1 else np.nan
+    return mean, std
+
+
+def _pearson_corr_numpy(values: np.ndarray, target: np.ndarray) -> float:
+    """NumPy fallback: pairwise-complete rows through np.corrcoef, as Series.corr does"""
+    valid = ~np.isnan(values)
+    if valid.sum() < 2:
+        return np.nan
+    return float(np.corrcoef(values[valid].astype(np.float64), target[valid].astype(np.float64))[0, 1])
+
+
+if NUMBA_AVAILABLE:
+    # fastmath is left off: it assumes no NaNs, and the inputs have missing values.
+    # The loop is memory-bound, so a serial loop beats parallel=True here, and it
+    # avoids starting Numba's threading layer from the service worker threads.
+    @njit(cache=True)
+    def _fraud_probability_numba(velocity, geo, spending, time_since_last, noise, use_noise):
+        n = velocity.size
+        out = np.empty(n, dtype=np.float32)
+        for i in range(n):
+            x = velocity[i] * W_VELOCITY
+            x += geo[i] * W_GEO
+            x += spending[i] * W_SPENDING
+            x += W_RAPID if time_since_last[i] < 60 else np.float32(0.0)
+            if use_noise:
+                x += noise[i] * W_NOISE
+            if x < 0:
+                x = np.float32(0.0)
+            elif x > 1:
+                x = np.float32(1.0)
+            out[i] = x
+        return out
+    
+    # Rows arrive in time order, so each account's previous transaction is
+    # just the last one seen for it: no sort, O(accounts) state
+    @njit(cache=True)
+    def _impossible_travel_numba(sender_codes, ts_ns, location_codes, num_accounts):
+        last_ts = np.full(num_accounts, NAT_NS, dtype=np.int64)
+        last_location = np.zeros(num_accounts, dtype=location_codes.dtype)
+        count = 0
+        for i in range(ts_ns.size):
+            account = sender_codes[i]
+            ts = ts_ns[i]
+            if account < 0 or ts == NAT_NS:
+                continue
+            prev_ts = last_ts[account]
+            if prev_ts != NAT_NS:
+                diff = ts - prev_ts
+                location = location_codes[i]
+                if 0 < diff < TRAVEL_WINDOW_NS and (location != last_location[account] or location < 0):
+                    count += 1
+            last_ts[account] = ts
+            last_location[account] = location_codes[i]
+        return count
+    
+    # Two passes over one (cache-resident) column: a one-pass Welford update
+    # divides per element, which costs more than reading the column twice
+    @njit(cache=True)
+    def _mean_std_numba(values):
+        total = 0.0
+        n = 0
+        for i in range(values.size):
+            x = values[i]
+            if not np.isnan(x):
+                total += x
+                n += 1
+        if n == 0:
+            return np.nan, np.nan
+        mean = total / n
+        if n < 2:
+            return mean, np.nan
+        squares = 0.0
+        for i in range(values.size):
+            x = values[i]
+            if not np.isnan(x):
+                squares += (x - mean) * (x - mean)
+        return mean, np.sqrt(squares / (n - 1))
+    
+    # Same two-pass shape as _mean_std_numba: means first, then centered sums
+    @njit(cache=True)
+    def _pearson_corr_numba(values, target):
+        total_x = 0.0
+        total_y = 0.0
+        n = 0
+        for i in range(values.size):
+            x = values[i]
+            if not np.isnan(x):
+                total_x += x
+                total_y += target[i]
+                n += 1
+        if n < 2:
+            return np.nan
+        mean_x = total_x / n
+        mean_y = total_y / n
+        sxy = 0.0
+        sxx = 0.0
+        syy = 0.0
+        for i in range(values.size):
+            x = values[i]
+            if not np.isnan(x):
+                dx = x - mean_x
+                dy = target[i] - mean_y
+                sxy += dx * dy
+                sxx += dx * dx
+                syy += dy * dy
+        if sxx == 0.0 or syy == 0.0:
+            return np.nan
+        return max(-1.0, min(1.0, sxy / np.sqrt(sxx * syy)))
+
+
+def fraud_probability(velocity: np.ndarray, geo: np.ndarray, spending: np.ndarray,
+                      time_since_last: np.ndarray, noise: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Simulated fraud probability from behavioral features
+    
+    Args:
+        velocity: velocity_score (float32)
+        geo: geo_anomaly_score (float32)
+        spending: spending_deviation_score (float32)
+        time_since_last: time_since_last_transaction in seconds (float32)
+        noise: Uniform [0, 1) random factor (float32), or None for none
+    
+    Returns:
+        float32 array of probabilities clipped to [0, 1]
+    """
+    if NUMBA_AVAILABLE:
+        use_noise = noise is not None
+        return _fraud_probability_numba(velocity, geo, spending, time_since_last,
+                                        noise if use_noise else np.empty(0, dtype=np.float32), use_noise)
+    return _fraud_probability_numpy(velocity, geo, spending, time_since_last, noise)
+
+
+def impossible_travel_count(sender_codes: np.ndarray, ts_ns: np.ndarray, location_codes: np.ndarray,
+                            num_accounts: int) -> int:
+    """
+    Count transactions made from a different location than the same sender's
+    previous transaction, less than two hours after it
+    
+    Args:
+        sender_codes: Sender account codes, -1 for missing (int32)
+        ts_ns: Timestamps as int64 nanoseconds, sorted ascending with NaT first
+        location_codes: Location codes, -1 for missing (int32)
+        num_accounts: Number of distinct account codes
+    
+    Returns:
+        Number of impossible-travel transactions
+    """
+    if NUMBA_AVAILABLE:
+        return int(_impossible_travel_numba(sender_codes, ts_ns, location_codes, num_accounts))
+    return _impossible_travel_numpy(sender_codes, ts_ns, location_codes, num_accounts)
+
+
+def mean_std(values: np.ndarray) -> Tuple[float, float]:
+    """
+    Mean and sample standard deviation (ddof=1) of a column, skipping NaNs
+    
+    Args:
+        values: float32 or float64 array
+    
+    Returns:
+        (mean, std); NaN where there are too few values
+    """
+    if NUMBA_AVAILABLE:
+        mean, std = _mean_std_numba(values)
+        return float(mean), float(std)
+    return _mean_std_numpy(values)
+
+
+def pearson_corr(values: np.ndarray, target: np.ndarray) -> float:
+    """
+    Pearson correlation of a column with a complete target, skipping rows
+    where the column is NaN (same as Series.corr)
+    
+    Args:
+        values: float32 or float64 array
+        target: Array with no missing values (e.g. the bool is_fraud column)
+    
+    Returns:
+        Correlation in [-1, 1]; NaN for fewer than two rows or a constant input
+    """
+    if NUMBA_AVAILABLE:
+        return float(_pearson_corr_numba(values, target))
+    return _pearson_corr_numpy(values, target)
+
+
+def warm_up() -> None:
+    """
+    Compile (or load from the on-disk cache) the JIT kernels ahead of use
+    
+    The first call of a Numba kernel pays for compilation, so each kernel is
+    run once on dummy rows (fraud_probability with and without noise).
+    No-op when Numba is not installed.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    start = time.perf_counter()
+    dummy = np.zeros(1, dtype=np.float32)
+    fraud_probability(dummy, dummy, dummy, dummy)
+    fraud_probability(dummy, dummy, dummy, dummy, dummy)
+    codes = np.zeros(1, dtype=np.int32)
+    impossible_travel_count(codes, np.zeros(1, dtype=np.int64), codes, 1)
+    mean_std(dummy)
+    pearson_corr(dummy, np.zeros(1, dtype=bool))
+    logger.info(f"Numba kernels ready in {time.perf_counter() - start:.2f}s")
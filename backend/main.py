@@ -1,9 +1,10 @@
 """
 Main FastAPI application for Fraud Detection Dashboard Backend
 """
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 import logging
 import time
@@ -11,7 +12,9 @@ from datetime import datetime
 
 from backend.config import settings
 from backend.api.v1.router import api_router
+from backend.data import kernels
 from backend.data.data_loader import data_loader
+from backend.services.executor import run_sync, start_executor, shutdown_executor
 from backend.models.schemas import HealthCheckResponse
 
 # Configure logging
@@ -30,10 +33,16 @@ async def lifespan(app: FastAPI):
     # Startup: Load data
     logger.info("Starting Fraud Detection Dashboard API...")
     logger.info(f"Data file: {settings.DATA_FILE_PATH}")
+    start_executor()
     
     try:
-        # Preload data in background (optional, data loads on first request)
-        # data_loader.load_data()
+        # Compile the preprocessing kernels up front so neither the initial
+        # load nor a later reload pays the JIT cost
+        await run_sync(kernels.warm_up)
+        
+        # Preload data in a worker thread before accepting traffic so the
+        # first request doesn't stall the event loop
+        await data_loader.aload()
         logger.info("API ready to accept requests")
     except Exception as e:
         logger.error(f"Error during startup: {str(e)}")
@@ -42,6 +51,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down API...")
+    shutdown_executor()
 
 
 # Create FastAPI application
@@ -105,6 +115,7 @@ app = FastAPI(
     """,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -130,27 +141,66 @@ else:
         allow_headers=["*"],
     )
 
+# Compress JSON bodies over 1 KB (heatmaps, graphs and feeds are highly repetitive)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Middleware for request logging and timing
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests with timing"""
-    start_time = time.time()
+    start_time = time.perf_counter()
     
     # Process request
     response = await call_next(request)
     
     # Calculate duration
-    duration = time.time() - start_time
+    duration = time.perf_counter() - start_time
     
-    # Log request details
-    logger.info(
-        f"{request.method} {request.url.path} "
-        f"completed in {duration:.3f}s with status {response.status_code}"
-    )
+    # Log request details (set ACCESS_LOG=false to skip on busy deployments)
+    if settings.ACCESS_LOG:
+        logger.info(
+            f"{request.method} {request.url.path} "
+            f"completed in {duration:.3f}s with status {response.status_code}"
+        )
     
     # Add timing header
-    response.headers["X-Process-Time"] = str(duration)
+    response.headers["X-Process-Time"] = f"{duration:.6f}"
+    
+    return response
+
+
+# Routes whose results are fixed until the data reloads (their services are
+# @cached(expires=False)); clients and CDNs may reuse these
+CACHEABLE_PATHS = frozenset(
+    f"{settings.API_V1_PREFIX}{path}" for path in (
+        "/analytics/geo-anomaly-hotspots",
+        "/analytics/merchant-channel-risk",
+        "/network/fraud-network-graph",
+        "/network/mule-accounts",
+    )
+)
+
+
+# Middleware for client/CDN caching of analytics responses
+@app.middleware("http")
+async def add_cache_headers(request: Request, call_next):
+    """
+    Let browsers and CDNs reuse static analytics results for as long as the
+    server-side cache does; everything else (the live feeds the dashboard
+    polls every few seconds) must be revalidated
+    """
+    response = await call_next(request)
+    
+    if (
+        request.method == "GET"
+        and request.url.path.startswith(settings.API_V1_PREFIX)
+        and response.status_code == 200
+    ):
+        if settings.CACHE_ENABLED and request.url.path in CACHEABLE_PATHS:
+            response.headers.setdefault("Cache-Control", f"public, max-age={settings.CACHE_TTL}")
+        else:
+            response.headers.setdefault("Cache-Control", "no-cache")
     
     return response
 
@@ -158,21 +208,27 @@ async def log_requests(request: Request, call_next):
 # Exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
-    """Global exception handler"""
-    logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    """
+    Global exception handler
+    
+    Routes don't catch errors themselves; anything a service raises ends up
+    here and is logged with its traceback once.
+    """
+    logger.exception(f"Unhandled exception on {request.method} {request.url.path}: {str(exc)}")
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
             "detail": str(exc) if settings.DEBUG else "An error occurred",
-            "timestamp": datetime.now().isoformat()
+            "timestamp": datetime.now()
         }
     )
 
 
 # Health check endpoint
-@app.get("/health", response_model=HealthCheckResponse, tags=["System"])
-async def health_check():
+@app.get("/health", response_model=HealthCheckResponse, tags=["System"],
+         responses={503: {"model": HealthCheckResponse, "description": "Data not loaded yet"}})
+async def health_check(response: Response):
     """
     **System Health Check** - Verify API is running and data is loaded
     
@@ -180,8 +236,13 @@ async def health_check():
     - API status
     - Data loading status
     - Dataset information
+    
+    Answers 503 until the dataset is in memory, so load balancers and
+    readiness probes only route traffic to workers that can serve it.
     """
     data_info = data_loader.data_info
+    if not data_info.get("loaded", False):
+        response.status_code = 503
     
     return HealthCheckResponse(
         status="healthy" if data_info.get("loaded", False) else "degraded",
@@ -219,6 +280,8 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.DEBUG,
-        log_level="info"
+        log_level="info",
+        limit_concurrency=settings.LIMIT_CONCURRENCY,
+        timeout_keep_alive=settings.KEEP_ALIVE_TIMEOUT
     )
 
@@ -1,7 +1,7 @@
 """
 Pydantic models for API request/response validation
 """
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
@@ -34,6 +34,17 @@ class TransactionType(str, Enum):
 
 # Response Models
 
+class RecordModel(BaseModel):
+    """
+    Base for the per-row records in list responses (feed items, graph
+    elements, alerts)
+    
+    Records are immutable once built, so instances held in the service cache
+    can be shared across responses safely; unknown keys are dropped.
+    """
+    model_config = ConfigDict(frozen=True, extra='ignore')
+
+
 class HealthCheckResponse(BaseModel):
     """Health check response"""
     status: str
@@ -53,7 +64,7 @@ class ExecutiveOverviewResponse(BaseModel):
     timestamp: datetime
 
 
-class HighRiskTransaction(BaseModel):
+class HighRiskTransaction(RecordModel):
     """High-risk transaction details"""
     transaction_id: str
     amount: float
@@ -94,7 +105,7 @@ class FraudVelocityHeatmapResponse(BaseModel):
     avg_rate: float
 
 
-class NetworkNode(BaseModel):
+class NetworkNode(RecordModel):
     """Network graph node"""
     id: str
     account_id: str
@@ -104,7 +115,7 @@ class NetworkNode(BaseModel):
     node_type: str  # "sender", "receiver", "both"
 
 
-class NetworkEdge(BaseModel):
+class NetworkEdge(RecordModel):
     """Network graph edge"""
     source: str
     target: str
@@ -113,7 +124,7 @@ class NetworkEdge(BaseModel):
     avg_fraud_probability: float
 
 
-class FraudRing(BaseModel):
+class FraudRing(RecordModel):
     """Detected fraud ring"""
     ring_id: str
     account_count: int
@@ -302,7 +313,7 @@ class MerchantChannelRiskResponse(BaseModel):
     recommendations: List[str]
 
 
-class Alert(BaseModel):
+class Alert(RecordModel):
     """Alert item"""
     alert_id: str
     severity: RiskLevel
@@ -0,0 +1,69 @@
+"""
+In-process TTL cache for service results
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple
+
+from backend.config import settings
+from backend.data.data_loader import data_loader
+
+
+def cached(func: Optional[Callable] = None, *, maxsize: int = 128, expires: bool = True) -> Callable:
+    """
+    Memoize a service method on its arguments for CACHE_TTL seconds
+    
+    Entries are keyed on the loaded data version as well, so reloading the
+    dataset invalidates everything computed from the previous one.
+    
+    Args:
+        func: Function to wrap
+        maxsize: Maximum number of entries kept (oldest evicted first)
+        expires: Drop entries after CACHE_TTL seconds. Pass False for results
+            that depend only on the data (no clock, no randomness); they are
+            then kept until the data is reloaded.
+    
+    Returns:
+        Wrapped function with a ``cache_clear()`` helper
+    """
+    if func is None:
+        return lambda f: cached(f, maxsize=maxsize, expires=expires)
+    
+    store: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+    lock = threading.Lock()
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not settings.CACHE_ENABLED:
+            return func(*args, **kwargs)
+        
+        key = (data_loader.version, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        
+        with lock:
+            hit = store.get(key)
+            if hit is not None and (not expires or now - hit[0] < settings.CACHE_TTL):
+                store.move_to_end(key)
+                return hit[1]
+        
+        result = func(*args, **kwargs)
+        
+        with lock:
+            # Entries for an older data version can never be hit again
+            for stale in [k for k in store if k[0] != key[0]]:
+                del store[stale]
+            store[key] = (now, result)
+            store.move_to_end(key)
+            while len(store) > maxsize:
+                store.popitem(last=False)
+        
+        return result
+    
+    def cache_clear() -> None:
+        with lock:
+            store.clear()
+    
+    wrapper.cache_clear = cache_clear
+    return wrapper
@@ -0,0 +1,79 @@
+"""
+Bounded worker pool for running CPU-bound service calls off the event loop
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, List, Optional
+import logging
+
+from backend.config import settings
+
+logger = logging.getLogger(__name__)
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Sub-computations fanned out by a service call. Kept apart from the service
+# pool: the caller already holds a service worker, so waiting on that pool
+# could deadlock once every worker is waiting.
+_task_executor: Optional[ThreadPoolExecutor] = None
+
+
+def start_executor() -> None:
+    """Create the shared pools (called from the application lifespan)"""
+    global _executor, _task_executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=settings.MAX_WORKERS, thread_name_prefix="service")
+        _task_executor = ThreadPoolExecutor(max_workers=settings.MAX_WORKERS, thread_name_prefix="subtask")
+        logger.info(f"Service executor started with {settings.MAX_WORKERS} workers")
+
+
+def shutdown_executor() -> None:
+    """Stop the shared pools, waiting for running calls to finish"""
+    global _executor, _task_executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _task_executor.shutdown(wait=True)
+        _executor = None
+        _task_executor = None
+
+
+async def run_sync(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking service call in the worker pool and await its result
+    
+    Pandas, NumPy and DuckDB release the GIL for most of their work, so
+    calls on different threads overlap while the event loop keeps serving
+    other requests. The pool size caps how many run at once.
+    
+    Args:
+        func: Synchronous callable to run
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+    
+    Returns:
+        Whatever func returns
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+
+
+def run_parallel(*funcs: Callable[[], Any]) -> List[Any]:
+    """
+    Run independent blocking parts of one service call concurrently
+    
+    The first function runs on the calling thread, the rest on the sub-task
+    pool. The parts must not share mutable state. Without a started pool
+    (scripts calling the services directly) they simply run in order.
+    
+    Args:
+        *funcs: Zero-argument callables
+    
+    Returns:
+        Their results, in argument order
+    """
+    if _task_executor is None:
+        return [func() for func in funcs]
+    futures = [_task_executor.submit(func) for func in funcs[1:]]
+    first = funcs[0]()
+    return [first] + [future.result() for future in futures]
@@ -5,10 +5,10 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Any, Tuple
 from datetime import datetime, timedelta
-from collections import defaultdict
 import logging
 
-from backend.data.data_loader import data_loader
+from backend.data.data_loader import data_loader, DAY_NS
+from backend.services.cache import cached
 from backend.models.schemas import (
     HighRiskTransaction, RiskLevel, FraudTypeStats,
     AccountAtRisk, BehavioralAnomaly, Alert
@@ -16,11 +16,24 @@ from backend.models.schemas import (
 
 logger = logging.getLogger(__name__)
 
+# Columns the high-risk feed reads from each transaction
+FEED_COLUMNS = [
+    'transaction_id', 'amount', 'fraud_type', 'location', 'device_used', 'fraud_probability',
+    'time_since_last_transaction', 'timestamp', 'sender_account', 'receiver_account'
+]
+
+# Per-account aggregates each at-risk target is built from, in unpacking order
+TARGET_COLUMNS = [
+    'sender_account', 'velocity_score', 'device_used', 'geo_anomaly_score',
+    'spending_deviation_score', 'location', 'risk_score', 'timestamp'
+]
+
 
 class FraudDetectionService:
     """Service for fraud detection operations"""
     
     @staticmethod
+    @cached
     def get_executive_overview(hours: int = 24) -> Dict[str, Any]:
         """
         Calculate executive overview metrics
@@ -31,30 +44,31 @@ class FraudDetectionService:
         Returns:
             Dictionary with KPI metrics
         """
-        df = data_loader.get_data()
-        
-        # Current period
-        cutoff = df['timestamp'].max() - timedelta(hours=hours)
-        current = df[df['timestamp'] >= cutoff]
+        # Current period (totals from the hourly rollup)
+        cutoff = data_loader.get_latest_timestamp() - timedelta(hours=hours)
+        current = data_loader.get_hourly_rollup(cutoff).sum(numeric_only=True)
         
         # Previous period for comparison
         prev_cutoff = cutoff - timedelta(hours=hours)
-        previous = df[(df['timestamp'] >= prev_cutoff) & (df['timestamp'] < cutoff)]
+        previous = data_loader.get_hourly_rollup(prev_cutoff, cutoff).sum(numeric_only=True)
         
         # Calculate metrics
-        fraud_amount_today = float(current[current['is_fraud']]['amount'].sum())
-        fraud_rate_24h = float(current['is_fraud'].mean() * 100)
-        prev_fraud_rate = float(previous['is_fraud'].mean() * 100) if len(previous) > 0 else fraud_rate_24h
+        fraud_amount_today = float(current['fraud_amount'])
+        fraud_rate_24h = float(current['fraud_count'] / current['transaction_count'] * 100)
+        prev_fraud_rate = (
+            float(previous['fraud_count'] / previous['transaction_count'] * 100)
+            if previous['transaction_count'] > 0 else fraud_rate_24h
+        )
         fraud_rate_change = fraud_rate_24h - prev_fraud_rate
         
-        # Simulate blocked amount (amount that would have been lost)
-        blocked_amount = float(current[current['fraud_probability'] >= 0.75]['amount'].sum())
+        # Simulate blocked amount (amount that would have been lost, probability >= 0.75)
+        blocked_amount = float(current['high_risk_amount'])
         
         # Simulate detection time (based on velocity score - higher = faster detection)
-        avg_detection_time = float(current['velocity_score'].mean() * 2)  # Scaled to seconds
+        avg_detection_time = float(current['velocity_sum'] / current['velocity_count'] * 2)  # Scaled to seconds
         
         # Count alerts
-        alerts_pending = int(len(current[current['fraud_probability'] >= 0.75]))
+        alerts_pending = int(current['high_risk_count'])
         
         return {
             'fraud_amount_today': round(fraud_amount_today, 2),
@@ -67,6 +81,7 @@ class FraudDetectionService:
         }
     
     @staticmethod
+    @cached
     def get_high_risk_transactions(limit: int = 50) -> Dict[str, Any]:
         """
         Get high-risk transactions feed
@@ -77,49 +92,49 @@ class FraudDetectionService:
         Returns:
             Dictionary with categorized high-risk transactions
         """
-        df = data_loader.get_data()
-        
         # Get recent high-risk transactions
-        recent_cutoff = df['timestamp'].max() - timedelta(hours=24)
-        recent = df[df['timestamp'] >= recent_cutoff].copy()
-        
-        # Sort by fraud probability
-        high_risk = recent[recent['fraud_probability'] >= 0.75].nlargest(limit, 'fraud_probability')
-        
-        critical_alerts = []
-        for _, row in high_risk.iterrows():
-            # Handle NA/null values
-            fraud_type = row.get('fraud_type')
-            if pd.isna(fraud_type):
-                fraud_type = 'Unknown'
-            
-            critical_alerts.append(HighRiskTransaction(
-                transaction_id=str(row['transaction_id']),
-                amount=float(row['amount']),
-                fraud_type=str(fraud_type),
-                location=str(row['location']),
-                device_used=str(row['device_used']),
-                confidence=float(row['fraud_probability']),
-                time_since_last=float(row['time_since_last_transaction']),
-                timestamp=row['timestamp'],
-                risk_level=RiskLevel.CRITICAL if row['fraud_probability'] >= 0.9 else RiskLevel.HIGH,
-                sender_account=str(row['sender_account']),
-                receiver_account=str(row['receiver_account'])
-            ))
+        recent_cutoff = data_loader.get_latest_timestamp() - timedelta(hours=24)
+        recent = data_loader.get_columns(FEED_COLUMNS, ts_from=recent_cutoff)
+        
+        fraud_probability = recent['fraud_probability'].to_numpy()
+        
+        # Sort by fraud probability; only the top 20 become alerts, the rest are just counted
+        high_risk_count = min(limit, int(np.count_nonzero(fraud_probability >= 0.75)))
+        high_risk = data_loader.top_rows(recent, 'fraud_probability', min(limit, 20), 0.75)
+        
+        critical_alerts = [
+            HighRiskTransaction(
+                transaction_id=str(transaction_id),
+                amount=float(amount),
+                fraud_type='Unknown' if pd.isna(fraud_type) else str(fraud_type),  # Handle NA/null values
+                location=str(location),
+                device_used=str(device_used),
+                confidence=float(probability),
+                time_since_last=float(time_since_last),
+                timestamp=timestamp,
+                risk_level=RiskLevel.CRITICAL if probability >= 0.9 else RiskLevel.HIGH,
+                sender_account=str(sender_account),
+                receiver_account=str(receiver_account)
+            )
+            for (transaction_id, amount, fraud_type, location, device_used, probability,
+                 time_since_last, timestamp, sender_account, receiver_account)
+            in zip(*(high_risk[col].tolist() for col in FEED_COLUMNS))
+        ]
         
-        # Count by priority
-        high_priority_count = int(len(recent[recent['fraud_probability'].between(0.6, 0.75)]))
-        medium_priority_count = int(len(recent[recent['fraud_probability'].between(0.4, 0.6)]))
+        # Count by priority (inclusive bands, like Series.between)
+        high_priority_count = int(np.count_nonzero((fraud_probability >= 0.6) & (fraud_probability <= 0.75)))
+        medium_priority_count = int(np.count_nonzero((fraud_probability >= 0.4) & (fraud_probability <= 0.6)))
         
         return {
-            'critical_alerts': critical_alerts[:20],  # Top 20
+            'critical_alerts': critical_alerts,
             'high_priority_count': high_priority_count,
             'medium_priority_count': medium_priority_count,
-            'total_alerts': len(critical_alerts) + high_priority_count + medium_priority_count,
+            'total_alerts': high_risk_count + high_priority_count + medium_priority_count,
             'last_updated': datetime.now()
         }
     
     @staticmethod
+    @cached
     def get_fraud_velocity_heatmap(hours: int = 24) -> Dict[str, Any]:
         """
         Calculate fraud velocity by hour
@@ -130,44 +145,45 @@ class FraudDetectionService:
         Returns:
             Hourly fraud rate analysis
         """
-        df = data_loader.get_data()
-        
-        cutoff = df['timestamp'].max() - timedelta(hours=hours)
-        recent = df[df['timestamp'] >= cutoff].copy()
+        cutoff = data_loader.get_latest_timestamp() - timedelta(hours=hours)
         
-        # Group by hour
-        hourly = recent.groupby('hour').agg({
-            'is_fraud': ['sum', 'count', 'mean']
-        }).reset_index()
-        
-        hourly.columns = ['hour', 'fraud_count', 'transaction_count', 'fraud_rate']
+        # Group by hour of day (24 bins over the hourly rollup; hours with no rows are left out)
+        rollup = data_loader.get_hourly_rollup(cutoff)
+        hour_of_row = rollup['hour'].to_numpy()
+        hours_seen = np.flatnonzero(np.bincount(hour_of_row, minlength=24))
+        fraud_counts = np.bincount(hour_of_row, weights=rollup['fraud_count'].to_numpy(), minlength=24)[hours_seen]
+        transaction_counts = np.bincount(hour_of_row, weights=rollup['transaction_count'].to_numpy(), minlength=24)[hours_seen]
+        fraud_rates = fraud_counts / transaction_counts
         
         # Detect spikes (rate > 1.5x average)
-        avg_rate = hourly['fraud_rate'].mean()
+        avg_rate = fraud_rates.mean() if len(fraud_rates) else np.nan
         spike_threshold = avg_rate * 1.5
         
         hourly_rates = []
-        for _, row in hourly.iterrows():
+        for hour, fraud_count, transaction_count, fraud_rate in zip(
+            hours_seen.tolist(), fraud_counts.tolist(), transaction_counts.tolist(), fraud_rates.tolist()
+        ):
             hourly_rates.append({
-                'hour': int(row['hour']),
-                'fraud_rate': float(row['fraud_rate'] * 100),
-                'transaction_count': int(row['transaction_count']),
-                'fraud_count': int(row['fraud_count']),
-                'is_spike': bool(row['fraud_rate'] > spike_threshold)
+                'hour': int(hour),
+                'fraud_rate': float(fraud_rate * 100),
+                'transaction_count': int(transaction_count),
+                'fraud_count': int(fraud_count),
+                'is_spike': bool(fraud_rate > spike_threshold)
             })
         
         # Find peak attack window
-        peak_hour = hourly.loc[hourly['fraud_rate'].idxmax(), 'hour']
+        peak_hour = hours_seen[np.argmax(fraud_rates)]
         peak_attack_window = f"{int(peak_hour):02d}:00-{int(peak_hour)+1:02d}:00"
         
         return {
             'hourly_rates': hourly_rates,
             'peak_attack_window': peak_attack_window,
-            'current_rate': float(hourly['fraud_rate'].iloc[-1] * 100) if len(hourly) > 0 else 0.0,
+            'current_rate': float(fraud_rates[-1] * 100) if len(fraud_rates) > 0 else 0.0,
             'avg_rate': float(avg_rate * 100)
         }
     
     @staticmethod
+    @cached
     def get_fraud_type_breakdown() -> Dict[str, Any]:
         """
         Analyze fraud by type
@@ -175,40 +191,44 @@ class FraudDetectionService:
         Returns:
             Fraud type statistics
         """
-        df = data_loader.get_data()
-        fraud_df = df[df['is_fraud'] == True].copy()
-        
-        # Current week
-        week_cutoff = df['timestamp'].max() - timedelta(days=7)
-        current_week = fraud_df[fraud_df['timestamp'] >= week_cutoff]
+        fraud_df = data_loader.get_fraud_transactions(['timestamp', 'fraud_type'])
+        type_totals = data_loader.get_fraud_type_totals()
         
-        # Previous week
+        # Fraud rows are time-sorted, so each week is a binary-search slice
+        fraud_ts = fraud_df['timestamp'].to_numpy().view('i8')
+        week_cutoff = data_loader.get_latest_timestamp() - timedelta(days=7)
         prev_week_cutoff = week_cutoff - timedelta(days=7)
-        previous_week = fraud_df[
-            (fraud_df['timestamp'] >= prev_week_cutoff) & 
-            (fraud_df['timestamp'] < week_cutoff)
-        ]
+        prev_start, week_start = np.searchsorted(
+            fraud_ts, [pd.Timestamp(prev_week_cutoff).value, pd.Timestamp(week_cutoff).value]
+        )
+        
+        # Per-type counts for the current and previous week, aligned with type_totals rows
+        # (bin 0 collects the missing-type code -1)
+        fraud_type = fraud_df['fraud_type']
+        codes = fraud_type.cat.codes.to_numpy() + 1
+        positions = fraud_type.cat.categories.get_indexer(type_totals.index) + 1
+        num_bins = len(fraud_type.cat.categories) + 1
+        current_counts = np.bincount(codes[week_start:], minlength=num_bins)[positions]
+        prev_counts = np.bincount(codes[prev_start:week_start], minlength=num_bins)[positions]
         
         # Calculate stats by type
         fraud_types = []
-        current_counts = current_week['fraud_type'].value_counts()
-        prev_counts = previous_week['fraud_type'].value_counts()
         total_fraud = len(fraud_df)
         
-        for fraud_type, count in fraud_df['fraud_type'].value_counts().items():
+        for (fraud_type, count, amount_sum), current_type_count, prev_type_count in zip(
+            type_totals.itertuples(), current_counts, prev_counts
+        ):
             if pd.isna(fraud_type):
                 continue
                 
             percentage = (count / total_fraud) * 100
             
             # Calculate change
-            current_type_count = current_counts.get(fraud_type, 0)
-            prev_type_count = prev_counts.get(fraud_type, 0)
             change = 0.0
             if prev_type_count > 0:
                 change = ((current_type_count - prev_type_count) / prev_type_count) * 100
             
-            avg_amount = float(fraud_df[fraud_df['fraud_type'] == fraud_type]['amount'].mean())
+            avg_amount = float(amount_sum / count)
             
             fraud_types.append(FraudTypeStats(
                 fraud_type=fraud_type,
@@ -232,6 +252,7 @@ class FraudDetectionService:
         }
     
     @staticmethod
+    @cached
     def get_predictive_risk_scores(limit: int = 127) -> Dict[str, Any]:
         """
         Predict accounts at risk in next 24 hours
@@ -242,60 +263,68 @@ class FraudDetectionService:
         Returns:
             Accounts predicted to be at risk
         """
-        df = data_loader.get_data()
-        
         # Get recent non-fraud transactions with high risk indicators
-        recent = df[df['timestamp'] >= df['timestamp'].max() - timedelta(days=7)].copy()
-        
-        # Calculate risk score per account
-        account_risk = recent.groupby('sender_account').agg({
-            'velocity_score': 'mean',
-            'spending_deviation_score': 'mean',
-            'geo_anomaly_score': 'mean',
-            'fraud_probability': 'max',
-            'timestamp': 'max',
-            'device_used': 'nunique',
-            'location': 'nunique'
-        }).reset_index()
-        
-        # Calculate composite risk
+        cutoff = data_loader.get_latest_timestamp() - timedelta(days=7)
+        
+        # Calculate risk score per account (hash aggregate runs in DuckDB)
+        account_risk = data_loader.query(
+            """
+            SELECT sender_account,
+                   AVG(velocity_score) AS velocity_score,
+                   AVG(spending_deviation_score) AS spending_deviation_score,
+                   AVG(geo_anomaly_score) AS geo_anomaly_score,
+                   MAX(fraud_probability) AS fraud_probability,
+                   MAX(timestamp) AS timestamp,
+                   COUNT(DISTINCT device_used) AS device_used,
+                   COUNT(DISTINCT location) AS location
+            FROM tx
+            WHERE timestamp >= ? AND sender_account IS NOT NULL
+            GROUP BY sender_account
+            ORDER BY sender_account
+            """,
+            [cutoff]
+        ).to_pandas()
+        
+        # Calculate composite risk (on the bare arrays, no per-operation index alignment)
         account_risk['risk_score'] = (
-            account_risk['fraud_probability'] * 0.5 +
-            account_risk['velocity_score'] * 0.2 +
-            account_risk['geo_anomaly_score'] * 0.15 +
-            account_risk['spending_deviation_score'] * 0.15
+            account_risk['fraud_probability'].to_numpy() * 0.5 +
+            account_risk['velocity_score'].to_numpy() * 0.2 +
+            account_risk['geo_anomaly_score'].to_numpy() * 0.15 +
+            account_risk['spending_deviation_score'].to_numpy() * 0.15
         )
         
-        # Get top at-risk accounts
-        at_risk = account_risk.nlargest(limit, 'risk_score')
+        # Get top at-risk accounts (O(n) partition instead of nlargest's sort; NaN scores drop out)
+        at_risk = data_loader.top_rows(account_risk, 'risk_score', limit, -np.inf)
         
         high_probability_targets = []
-        for _, row in at_risk.head(20).iterrows():
+        for (account_id, velocity, devices, geo_anomaly, spending_deviation, locations,
+             risk_score, last_transaction_time) in zip(*(at_risk[col].head(20).tolist() for col in TARGET_COLUMNS)):
             risk_factors = []
-            if row['velocity_score'] > 0.7:
+            if velocity > 0.7:
                 risk_factors.append("Unusual velocity spike")
-            if row['device_used'] > 2:
+            if devices > 2:
                 risk_factors.append("New device detected")
-            if row['geo_anomaly_score'] > 0.7:
-                risk_factors.append(f"Geo-anomaly score: {row['geo_anomaly_score']:.1f}/10")
-            if row['spending_deviation_score'] > 0.7:
-                risk_factors.append(f"Spending deviation: +{row['spending_deviation_score']*100:.0f}%")
+            if geo_anomaly > 0.7:
+                risk_factors.append(f"Geo-anomaly score: {geo_anomaly:.1f}/10")
+            if spending_deviation > 0.7:
+                risk_factors.append(f"Spending deviation: +{spending_deviation*100:.0f}%")
             
             high_probability_targets.append(AccountAtRisk(
-                account_id=row['sender_account'],
-                fraud_risk=float(row['risk_score']),
+                account_id=account_id,
+                fraud_risk=float(risk_score),
                 risk_factors=risk_factors,
-                recent_anomalies=[f"Location changes: {int(row['location'])}"],
-                recommended_action="Enable 2FA" if row['risk_score'] > 0.8 else "Monitor closely",
-                last_transaction_time=row['timestamp']
+                recent_anomalies=[f"Location changes: {int(locations)}"],
+                recommended_action="Enable 2FA" if risk_score > 0.8 else "Monitor closely",
+                last_transaction_time=last_transaction_time
             ))
         
-        # Risk distribution
+        # Risk distribution (inclusive bands, like Series.between)
+        risk_scores = at_risk['risk_score'].to_numpy()
         risk_distribution = {
-            'critical': int(len(at_risk[at_risk['risk_score'] >= 0.85])),
-            'high': int(len(at_risk[at_risk['risk_score'].between(0.7, 0.85)])),
-            'medium': int(len(at_risk[at_risk['risk_score'].between(0.5, 0.7)])),
-            'low': int(len(at_risk[at_risk['risk_score'] < 0.5]))
+            'critical': int(np.count_nonzero(risk_scores >= 0.85)),
+            'high': int(np.count_nonzero((risk_scores >= 0.7) & (risk_scores <= 0.85))),
+            'medium': int(np.count_nonzero((risk_scores >= 0.5) & (risk_scores <= 0.7))),
+            'low': int(np.count_nonzero(risk_scores < 0.5))
         }
         
         return {
@@ -306,6 +335,7 @@ class FraudDetectionService:
         }
     
     @staticmethod
+    @cached
     def get_behavioral_anomalies() -> Dict[str, Any]:
         """
         Detect behavioral anomalies
@@ -313,13 +343,17 @@ class FraudDetectionService:
         Returns:
             List of detected anomalies
         """
-        df = data_loader.get_data()
-        recent = df[df['timestamp'] >= df['timestamp'].max() - timedelta(days=7)].copy()
+        cutoff = data_loader.get_latest_timestamp() - timedelta(days=7)
+        recent = data_loader.get_columns(['amount', 'device_used'], ts_from=cutoff)
+        
+        # Load-time account codes for the same rows, instead of re-coding the window
+        start, stop = data_loader.get_row_range(ts_from=cutoff)
+        sender_codes = data_loader.get_account_codes()[1][start:stop]
         
         anomalies = []
         
         # Testing phase detection (small then large)
-        testing_accounts = FraudDetectionService._detect_testing_phase(recent)
+        testing_accounts = FraudDetectionService._detect_testing_phase(recent, sender_codes)
         if testing_accounts > 0:
             anomalies.append(BehavioralAnomaly(
                 anomaly_type="testing_phase",
@@ -329,9 +363,7 @@ class FraudDetectionService:
             ))
         
         # Device switching
-        device_switching = len(recent.groupby('sender_account')['device_used'].nunique()[
-            recent.groupby('sender_account')['device_used'].nunique() > 2
-        ])
+        device_switching = FraudDetectionService._detect_device_switching(recent, sender_codes)
         if device_switching > 0:
             anomalies.append(BehavioralAnomaly(
                 anomaly_type="device_switching",
@@ -341,7 +373,9 @@ class FraudDetectionService:
             ))
         
         # Dormant account reactivation
-        dormant_reactivation = FraudDetectionService._detect_dormant_reactivation(df)
+        dormant_reactivation = FraudDetectionService._detect_dormant_reactivation(
+            data_loader.get_account_codes()[1], data_loader.get_timestamps_ns()
+        )
         if dormant_reactivation > 0:
             anomalies.append(BehavioralAnomaly(
                 anomaly_type="dormant_reactivation",
@@ -357,35 +391,57 @@ class FraudDetectionService:
         }
     
     @staticmethod
-    def _detect_testing_phase(df: pd.DataFrame) -> int:
-        """Detect accounts with testing phase pattern"""
-        # Group by account and check for small-then-large pattern
-        account_patterns = df.groupby('sender_account')['amount'].apply(list)
-        testing_count = 0
-        
-        for amounts in account_patterns:
-            if len(amounts) >= 3:
-                # Check if first transactions are small (<50) and later ones large (>500)
-                early = amounts[:2]
-                late = amounts[-2:]
-                if all(a < 50 for a in early) and any(a > 500 for a in late):
-                    testing_count += 1
-        
-        return testing_count
+    def _detect_testing_phase(df: pd.DataFrame, codes: np.ndarray) -> int:
+        """Detect accounts with testing phase pattern (codes: row-aligned sender codes)"""
+        # Contiguous per-account runs, in time order: a stable sort of the (time-sorted)
+        # rows by account code; rows without an account are dropped like groupby does
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        codes = codes[order]
+        amounts = df['amount'].to_numpy()[order]
+        
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        ends = np.r_[starts[1:], len(codes)]
+        
+        # Accounts with 3+ transactions: first two small (<50), one of the last two large (>500)
+        qualifies = ends - starts >= 3
+        starts, ends = starts[qualifies], ends[qualifies]
+        small_first = (amounts[starts] < 50) & (amounts[starts + 1] < 50)
+        large_last = (amounts[ends - 1] > 500) | (amounts[ends - 2] > 500)
+        
+        return int(np.count_nonzero(small_first & large_last))
     
     @staticmethod
-    def _detect_dormant_reactivation(df: pd.DataFrame) -> int:
-        """Detect dormant accounts that suddenly reactivate"""
-        # Calculate time gaps between transactions per account
-        df_sorted = df.sort_values(['sender_account', 'timestamp'])
-        df_sorted['time_gap'] = df_sorted.groupby('sender_account')['timestamp'].diff().dt.days
-        
-        # Find accounts with 90+ day gap followed by activity
-        dormant_accounts = df_sorted[df_sorted['time_gap'] >= 90]['sender_account'].unique()
-        
-        return len(dormant_accounts)
+    def _detect_device_switching(df: pd.DataFrame, codes: np.ndarray) -> int:
+        """Detect accounts that used more than two distinct devices (codes: row-aligned sender codes)"""
+        # Distinct (account, device) pairs as one int64 key each; missing accounts
+        # and devices are skipped, like groupby and nunique do
+        accounts = codes.astype(np.int64)
+        devices = df['device_used'].cat.codes.to_numpy().astype(np.int64)
+        present = (accounts >= 0) & (devices >= 0)
+        num_devices = len(df['device_used'].cat.categories)
+        pairs = np.unique(accounts[present] * num_devices + devices[present])
+        
+        devices_per_account = np.bincount(pairs // num_devices) if len(pairs) else pairs
+        return int(np.count_nonzero(devices_per_account > 2))
+    
+    @staticmethod
+    def _detect_dormant_reactivation(sender_codes: np.ndarray, ts_ns: np.ndarray) -> int:
+        """Detect dormant accounts that suddenly reactivate (row-aligned sender codes and timestamps)"""
+        # Rows are time-sorted with NaT first, and NaT never makes a gap; drop it. A stable
+        # sort by account then leaves each account's transactions in time order
+        first = int(np.searchsorted(ts_ns, np.iinfo(np.int64).min, side='right'))
+        order = np.argsort(sender_codes[first:], kind='stable')
+        codes = sender_codes[first:][order]
+        ts = ts_ns[first:][order]
+        
+        # Find accounts with a 90+ day gap followed by activity
+        dormant = (codes[1:] == codes[:-1]) & (codes[1:] >= 0) & (ts[1:] - ts[:-1] >= 90 * DAY_NS)
+        
+        return len(np.unique(codes[1:][dormant]))
     
     @staticmethod
+    @cached
     def generate_smart_alerts(hours: int = 24) -> Dict[str, Any]:
         """
         Generate smart alerts based on various conditions
@@ -396,9 +452,13 @@ class FraudDetectionService:
         Returns:
             Categorized alerts
         """
-        df = data_loader.get_data()
-        cutoff = df['timestamp'].max() - timedelta(hours=hours)
-        recent = df[df['timestamp'] >= cutoff]
+        cutoff = data_loader.get_latest_timestamp() - timedelta(hours=hours)
+        recent = data_loader.get_columns(['is_fraud', 'fraud_probability'], ts_from=cutoff)
+        start, stop = data_loader.get_row_range(ts_from=cutoff)
+        
+        # One clock read per call: every alert shares the same time and id prefix
+        now = datetime.now()
+        alert_prefix = f"ALERT_{now.strftime('%Y%m%d%H%M%S')}"
         
         critical_alerts = []
         warning_alerts = []
@@ -406,46 +466,46 @@ class FraudDetectionService:
         
         # Check for fraud rate spike
         current_rate = recent['is_fraud'].mean()
-        overall_rate = df['is_fraud'].mean()
+        overall_rate = data_loader.get_stats()['fraud_rate']
         
         if current_rate > overall_rate * 2:
             critical_alerts.append(Alert(
-                alert_id=f"ALERT_{datetime.now().strftime('%Y%m%d%H%M%S')}_001",
+                alert_id=f"{alert_prefix}_001",
                 severity=RiskLevel.CRITICAL,
                 title="Fraud Rate Spike Detected",
                 description=f"Fraud rate increased to {current_rate*100:.1f}% (+{(current_rate-overall_rate)*100:.1f}%)",
-                timestamp=datetime.now()
+                timestamp=now
             ))
         
         # Check for network anomalies
-        fraud_rings = FraudDetectionService._detect_simple_rings(recent)
+        fraud_rings = FraudDetectionService._detect_simple_rings(recent, start, stop)
         if fraud_rings > 0:
             critical_alerts.append(Alert(
-                alert_id=f"ALERT_{datetime.now().strftime('%Y%m%d%H%M%S')}_002",
+                alert_id=f"{alert_prefix}_002",
                 severity=RiskLevel.CRITICAL,
                 title=f"{fraud_rings} Fraud Ring(s) Detected",
                 description=f"Circular transaction patterns detected involving multiple accounts",
-                timestamp=datetime.now()
+                timestamp=now
             ))
         
         # Model performance warning (simulated)
         if np.random.random() < 0.3:  # 30% chance for demo
             warning_alerts.append(Alert(
-                alert_id=f"ALERT_{datetime.now().strftime('%Y%m%d%H%M%S')}_003",
+                alert_id=f"{alert_prefix}_003",
                 severity=RiskLevel.MEDIUM,
                 title="Model Performance Degradation",
                 description="Recall dropped 2.3% in the last week. Retrain recommended.",
-                timestamp=datetime.now()
+                timestamp=now
             ))
         
         # Info: High volume period
-        if len(recent) > df.groupby(df['timestamp'].dt.date).size().mean() * 1.2:
+        if len(recent) > data_loader.get_stats()['avg_daily_transactions'] * 1.2:
             info_alerts.append(Alert(
-                alert_id=f"ALERT_{datetime.now().strftime('%Y%m%d%H%M%S')}_004",
+                alert_id=f"{alert_prefix}_004",
                 severity=RiskLevel.LOW,
                 title="High Transaction Volume",
                 description=f"Transaction volume 20% above average: {len(recent):,} transactions",
-                timestamp=datetime.now()
+                timestamp=now
             ))
         
         return {
@@ -453,35 +513,37 @@ class FraudDetectionService:
             'warning_alerts': warning_alerts,
             'info_alerts': info_alerts,
             'total_unread': len(critical_alerts) + len(warning_alerts) + len(info_alerts),
-            'last_updated': datetime.now()
+            'last_updated': now
         }
     
     @staticmethod
-    def _detect_simple_rings(df: pd.DataFrame) -> int:
-        """Simple fraud ring detection"""
-        # Look for circular patterns: A->B, B->C, C->A
-        transactions = df[['sender_account', 'receiver_account', 'fraud_probability']]
-        high_risk = transactions[transactions['fraud_probability'] > 0.7]
-        
-        # Create adjacency list
-        graph = defaultdict(set)
-        for _, row in high_risk.iterrows():
-            graph[row['sender_account']].add(row['receiver_account'])
-        
-        # Simple cycle detection
-        rings = 0
-        visited = set()
-        
-        for node in graph:
-            if node in visited:
-                continue
-            # Check if any neighbor points back to this node (simple 2-cycle)
-            for neighbor in graph[node]:
-                if node in graph.get(neighbor, set()):
-                    rings += 1
-                    visited.add(node)
-                    visited.add(neighbor)
-                    break
-        
-        return rings
+    def _detect_simple_rings(df: pd.DataFrame, start: int, stop: int) -> int:
+        """
+        Simple fraud ring detection: account pairs that sent each other high-risk transactions
+        
+        Args:
+            df: Transactions in rows [start, stop) of the data
+            start: First row position
+            stop: Row position to stop before
+            
+        Returns:
+            Number of mutual account pairs
+        """
+        high_risk = df['fraud_probability'].to_numpy() > 0.7
+        
+        # Both endpoints are already coded against one shared set of accounts at load time
+        account_ids, sender_codes, receiver_codes = data_loader.get_account_codes()
+        senders = sender_codes[start:stop][high_risk].astype(np.int64)
+        receivers = receiver_codes[start:stop][high_risk].astype(np.int64)
+        keep = (senders >= 0) & (receivers >= 0) & (senders != receivers)
+        senders, receivers = senders[keep], receivers[keep]
+        
+        # Distinct directed edges as int64 keys; a 2-cycle A->B, B->A is an edge whose
+        # reverse is also present, counted once from its lower-coded end
+        num_accounts = len(account_ids)
+        edges = np.unique(senders * num_accounts + receivers)
+        reverse = (edges % num_accounts) * num_accounts + edges // num_accounts
+        mutual = np.isin(reverse, edges)
+        
+        return int(np.count_nonzero(mutual & (edges // num_accounts < edges % num_accounts)))
 
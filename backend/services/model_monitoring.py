@@ -3,21 +3,33 @@ Model performance monitoring and evaluation
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from backend.data import kernels
 from backend.data.data_loader import data_loader
+from backend.services.cache import cached
 from backend.config import settings
 from backend.models.schemas import ModelMetrics
 
 logger = logging.getLogger(__name__)
 
+# Columns the health metrics and drift checks read
+MONITORED_COLUMNS = [
+    'is_fraud', 'fraud_probability', 'amount',
+    'velocity_score', 'spending_deviation_score', 'geo_anomaly_score'
+]
+
+# Features whose distributions the drift checks compare
+DRIFT_COLUMNS = ['amount', 'velocity_score', 'spending_deviation_score', 'geo_anomaly_score']
+
 
 class ModelMonitoringService:
     """Service for ML model performance monitoring"""
     
     @staticmethod
+    @cached
     def get_model_health() -> Dict[str, Any]:
         """
         Get current model performance metrics
@@ -25,12 +37,10 @@ class ModelMonitoringService:
         Returns:
             Model health dashboard data
         """
-        df = data_loader.get_data()
-        
         # Split into recent and previous for comparison
-        cutoff = df['timestamp'].max() - timedelta(days=7)
-        recent = df[df['timestamp'] >= cutoff]
-        previous = df[df['timestamp'] < cutoff]
+        cutoff = data_loader.get_latest_timestamp() - timedelta(days=7)
+        recent = data_loader.get_columns(MONITORED_COLUMNS, ts_from=cutoff)
+        previous = data_loader.get_columns(MONITORED_COLUMNS, ts_to=cutoff)
         
         # Calculate metrics for recent period
         current_metrics = ModelMonitoringService._calculate_metrics(recent)
@@ -46,11 +56,15 @@ class ModelMonitoringService:
         # Simulated inference time (based on complexity)
         avg_inference_time = 0.85  # milliseconds
         
+        # Per-feature mean and std of both periods, computed once for both drift checks
+        recent_stats = ModelMonitoringService._column_stats(recent)
+        previous_stats = ModelMonitoringService._column_stats(previous)
+        
         # Data drift detection
-        data_drift_status = ModelMonitoringService._detect_data_drift(recent, previous)
+        data_drift_status = ModelMonitoringService._detect_data_drift(recent_stats, previous_stats)
         
         # Feature drift alerts
-        feature_drift_alerts = ModelMonitoringService._detect_feature_drift(recent, previous)
+        feature_drift_alerts = ModelMonitoringService._detect_feature_drift(recent_stats, previous_stats)
         
         # Generate recommendation
         recommendation = ModelMonitoringService._generate_recommendation(
@@ -58,7 +72,7 @@ class ModelMonitoringService:
         )
         
         # Simulated last retrain date
-        last_retrain = df['timestamp'].max() - timedelta(days=14)
+        last_retrain = data_loader.get_latest_timestamp() - timedelta(days=14)
         
         return {
             'current_metrics': current_metrics,
@@ -71,19 +85,24 @@ class ModelMonitoringService:
             'model_version': settings.MODEL_VERSION
         }
     
+    @staticmethod
+    def _outcome_codes(df: pd.DataFrame) -> np.ndarray:
+        """
+        Confusion-matrix cell of each row: 2 * actual + predicted
+        
+        fraud_probability >= 0.5 is the prediction, so 0 = TN, 1 = FP,
+        2 = FN, 3 = TP and one bincount gives all four counts.
+        """
+        y_true = df['is_fraud'].to_numpy()
+        y_pred = df['fraud_probability'].to_numpy() >= 0.5
+        return (y_true.astype(np.uint8) << 1) | y_pred.astype(np.uint8)
+    
     @staticmethod
     def _calculate_metrics(df: pd.DataFrame) -> ModelMetrics:
         """Calculate classification metrics"""
         
-        # Use fraud_probability as predictions (threshold at 0.5)
-        y_true = df['is_fraud'].values
-        y_pred = (df['fraud_probability'] >= 0.5).values
-        
-        # Calculate confusion matrix components
-        tp = np.sum((y_true == True) & (y_pred == True))
-        tn = np.sum((y_true == False) & (y_pred == False))
-        fp = np.sum((y_true == False) & (y_pred == True))
-        fn = np.sum((y_true == True) & (y_pred == False))
+        # Confusion matrix components (fraud_probability >= 0.5 as predictions)
+        tn, fp, fn, tp = np.bincount(ModelMonitoringService._outcome_codes(df), minlength=4)
         
         # Calculate metrics
         precision = tp / (tp + fp) if (tp + fp) > 0 else 0
@@ -103,18 +122,22 @@ class ModelMonitoringService:
         )
     
     @staticmethod
-    def _detect_data_drift(recent: pd.DataFrame, previous: pd.DataFrame) -> str:
+    def _column_stats(df: pd.DataFrame) -> Dict[str, Tuple[float, float]]:
+        """(mean, std) of each drift feature, one fused kernel call per column"""
+        return {col: kernels.mean_std(df[col].to_numpy()) for col in DRIFT_COLUMNS}
+    
+    @staticmethod
+    def _detect_data_drift(recent_stats: Dict[str, Tuple[float, float]],
+                           previous_stats: Dict[str, Tuple[float, float]]) -> str:
         """Detect overall data drift"""
         
         # Compare distributions of key features
         drift_scores = []
         
-        for col in ['amount', 'velocity_score', 'spending_deviation_score', 'geo_anomaly_score']:
+        for col in DRIFT_COLUMNS:
             # Simple drift detection using mean and std comparison
-            recent_mean = recent[col].mean()
-            prev_mean = previous[col].mean()
-            recent_std = recent[col].std()
-            prev_std = previous[col].std()
+            recent_mean, recent_std = recent_stats[col]
+            prev_mean, prev_std = previous_stats[col]
             
             # Calculate relative change
             mean_change = abs(recent_mean - prev_mean) / (prev_mean + 1e-10)
@@ -133,15 +156,16 @@ class ModelMonitoringService:
             return "LOW"
     
     @staticmethod
-    def _detect_feature_drift(recent: pd.DataFrame, previous: pd.DataFrame) -> List[str]:
+    def _detect_feature_drift(recent_stats: Dict[str, Tuple[float, float]],
+                              previous_stats: Dict[str, Tuple[float, float]]) -> List[str]:
         """Detect drift in specific features"""
         
         alerts = []
         
         # Check each feature
         for col in ['velocity_score', 'spending_deviation_score', 'geo_anomaly_score', 'amount']:
-            recent_mean = recent[col].mean()
-            prev_mean = previous[col].mean()
+            recent_mean = recent_stats[col][0]
+            prev_mean = previous_stats[col][0]
             
             change = abs(recent_mean - prev_mean) / (prev_mean + 1e-10)
             
@@ -180,6 +204,7 @@ class ModelMonitoringService:
         return " ".join(recommendations)
     
     @staticmethod
+    @cached
     def get_confusion_matrix() -> Dict[str, Any]:
         """
         Get confusion matrix for model predictions
@@ -187,18 +212,14 @@ class ModelMonitoringService:
         Returns:
             Confusion matrix data
         """
-        df = data_loader.get_data()
-        recent = df[df['timestamp'] >= df['timestamp'].max() - timedelta(days=7)]
-        
-        # Use fraud_probability as predictions
-        y_true = recent['is_fraud'].values
-        y_pred = (recent['fraud_probability'] >= 0.5).values
+        recent = data_loader.get_columns(
+            ['is_fraud', 'fraud_probability', 'amount'],
+            ts_from=data_loader.get_latest_timestamp() - timedelta(days=7)
+        )
         
-        # Calculate confusion matrix
-        tp = int(np.sum((y_true == True) & (y_pred == True)))
-        tn = int(np.sum((y_true == False) & (y_pred == False)))
-        fp = int(np.sum((y_true == False) & (y_pred == True)))
-        fn = int(np.sum((y_true == True) & (y_pred == False)))
+        # Calculate confusion matrix (fraud_probability as predictions)
+        outcomes = ModelMonitoringService._outcome_codes(recent)
+        tn, fp, fn, tp = (int(count) for count in np.bincount(outcomes, minlength=4))
         
         # Calculate rates
         fpr = fp / (fp + tn) if (fp + tn) > 0 else 0
@@ -206,9 +227,9 @@ class ModelMonitoringService:
         
         # Cost impact (simulated)
         # FP cost: $50 per false alarm (customer service)
-        # FN cost: Average fraud amount (actual loss)
+        # FN cost: Average fraud amount (actual loss), summed in float64 (amounts are float32)
         fp_cost = fp * 50
-        fn_cost = float(recent[(y_true == True) & (y_pred == False)]['amount'].sum())
+        fn_cost = float(recent['amount'].to_numpy(dtype=np.float64)[outcomes == 2].sum())
         total_cost = fp_cost + fn_cost
         
         return {
@@ -222,6 +243,7 @@ class ModelMonitoringService:
         }
     
     @staticmethod
+    @cached
     def get_feature_importance_global() -> List[Dict[str, Any]]:
         """
         Get global feature importance across all predictions
@@ -235,10 +257,12 @@ class ModelMonitoringService:
         features = ['velocity_score', 'geo_anomaly_score', 'spending_deviation_score', 
                     'time_since_last_transaction', 'amount']
         
+        is_fraud = df['is_fraud'].to_numpy()
+        
         importances = []
         for feature in features:
             # Use correlation as proxy for importance
-            corr = df[feature].corr(df['is_fraud'].astype(float))
+            corr = kernels.pearson_corr(df[feature].to_numpy(), is_fraud)
             importance = abs(corr) * 100
             
             importances.append({
@@ -3,12 +3,15 @@ Network analysis for fraud ring detection
 """
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Any, Set, Tuple
-from collections import defaultdict, deque
+from typing import List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
 from backend.data.data_loader import data_loader
+from backend.services.cache import cached
 from backend.models.schemas import NetworkNode, NetworkEdge, FraudRing
 
 logger = logging.getLogger(__name__)
@@ -18,6 +21,7 @@ class NetworkAnalysisService:
     """Service for network and graph analysis"""
     
     @staticmethod
+    @cached(expires=False)
     def get_fraud_network_graph(min_transactions: int = 3, 
                                  min_fraud_prob: float = 0.6) -> Dict[str, Any]:
         """
@@ -31,36 +35,61 @@ class NetworkAnalysisService:
             Network graph with nodes, edges, and detected rings
         """
         df = data_loader.get_data()
+        account_ids, sender_codes, receiver_codes = data_loader.get_account_codes()
         
-        # Filter to suspicious transactions
-        suspicious = df[df['fraud_probability'] >= min_fraud_prob].copy()
+        # Filter to suspicious transactions (as integer-coded edges); float32 columns are
+        # widened after the mask, so only the selected rows are converted
+        fraud_probability = df['fraud_probability'].to_numpy()
+        mask = fraud_probability >= min_fraud_prob
+        mask &= (sender_codes >= 0) & (receiver_codes >= 0)
+        txns = {
+            'sender': sender_codes[mask],
+            'receiver': receiver_codes[mask],
+            'amount': df['amount'].to_numpy()[mask].astype(np.float64),
+            'fraud_probability': fraud_probability[mask].astype(np.float64)
+        }
         
         # Build transaction pairs
-        pairs = suspicious.groupby(['sender_account', 'receiver_account']).agg({
-            'transaction_id': 'count',
-            'amount': 'sum',
-            'fraud_probability': 'mean'
-        }).reset_index()
-        
-        pairs.columns = ['sender', 'receiver', 'transaction_count', 'total_amount', 'avg_fraud_prob']
+        pairs = NetworkAnalysisService._aggregate_pairs(txns, len(account_ids))
         pairs = pairs[pairs['transaction_count'] >= min_transactions]
         
+        # Nothing left to graph (common for high thresholds)
+        if pairs.empty:
+            return {
+                'nodes': [],
+                'edges': [],
+                'fraud_rings': [],
+                'rings_detected': 0,
+                'total_accounts': 0,
+                'total_volume': 0.0
+            }
+        
+        # Accounts in any kept pair (sorted codes), and each pair endpoint's position among them
+        accounts, endpoints = np.unique(
+            np.concatenate([pairs['sender'].to_numpy(), pairs['receiver'].to_numpy()]), return_inverse=True
+        )
+        
         # Build nodes
-        nodes_dict = NetworkAnalysisService._build_nodes(suspicious, pairs)
-        
-        # Build edges
-        edges = []
-        for _, row in pairs.iterrows():
-            edges.append(NetworkEdge(
-                source=row['sender'],
-                target=row['receiver'],
-                transaction_count=int(row['transaction_count']),
-                total_amount=float(row['total_amount']),
-                avg_fraud_probability=float(row['avg_fraud_prob'])
-            ))
+        nodes_dict = NetworkAnalysisService._build_nodes(txns, accounts, account_ids)
+        
+        # Build edges (only the 200 that are returned)
+        shown = pairs.head(200)
+        edges = [
+            NetworkEdge(
+                source=source,
+                target=target,
+                transaction_count=transaction_count,
+                total_amount=total_amount,
+                avg_fraud_probability=avg_fraud_prob
+            )
+            for source, target, transaction_count, total_amount, avg_fraud_prob in zip(
+                account_ids[shown['sender'].to_numpy()].tolist(), account_ids[shown['receiver'].to_numpy()].tolist(),
+                shown['transaction_count'].tolist(), shown['total_amount'].tolist(), shown['avg_fraud_prob'].tolist()
+            )
+        ]
         
         # Detect fraud rings
-        fraud_rings = NetworkAnalysisService._detect_fraud_rings(pairs, suspicious)
+        fraud_rings = NetworkAnalysisService._detect_fraud_rings(accounts, endpoints, txns, account_ids)
         
         # Calculate summary stats
         total_volume = float(pairs['total_amount'].sum())
@@ -68,7 +97,7 @@ class NetworkAnalysisService:
         
         return {
             'nodes': list(nodes_dict.values()),
-            'edges': edges[:200],  # Limit for visualization
+            'edges': edges,  # Limited to 200 for visualization
             'fraud_rings': fraud_rings,
             'rings_detected': len(fraud_rings),
             'total_accounts': total_accounts,
@@ -76,33 +105,69 @@ class NetworkAnalysisService:
         }
     
     @staticmethod
-    def _build_nodes(df: pd.DataFrame, pairs: pd.DataFrame) -> Dict[str, NetworkNode]:
-        """Build network nodes from transactions"""
+    def _aggregate_pairs(txns: Dict[str, np.ndarray], num_accounts: int) -> pd.DataFrame:
+        """
+        Aggregate coded transactions per (sender, receiver) pair
+        
+        Args:
+            txns: Row-aligned arrays of sender/receiver codes, amount and fraud probability
+            num_accounts: Number of distinct account codes
+            
+        Returns:
+            One row per pair, ordered by (sender, receiver)
+        """
+        keys = txns['sender'].astype(np.int64) * num_accounts + txns['receiver']
+        pair_keys, inverse = np.unique(keys, return_inverse=True)
+        
+        transaction_count = np.bincount(inverse)
+        total_amount = np.bincount(inverse, weights=txns['amount'])
+        prob_sum = np.bincount(inverse, weights=txns['fraud_probability'])
+        
+        return pd.DataFrame({
+            'sender': (pair_keys // num_accounts).astype(np.int32),
+            'receiver': (pair_keys % num_accounts).astype(np.int32),
+            'transaction_count': transaction_count,
+            'total_amount': total_amount,
+            'avg_fraud_prob': prob_sum / np.maximum(transaction_count, 1)
+        })
+    
+    @staticmethod
+    def _build_nodes(txns: Dict[str, np.ndarray], all_accounts: np.ndarray,
+                     account_ids: np.ndarray) -> Dict[str, NetworkNode]:
+        """Build network nodes from transactions (all_accounts: sorted codes of the accounts in a pair)"""
         nodes = {}
         
-        # Get all accounts involved
-        all_accounts = set(pairs['sender'].unique()) | set(pairs['receiver'].unique())
+        if len(all_accounts) == 0:
+            return nodes
         
-        for account in all_accounts:
-            # Get account statistics
-            sent = df[df['sender_account'] == account]
-            received = df[df['receiver_account'] == account]
-            
-            transaction_count = len(sent) + len(received)
-            total_volume = float(sent['amount'].sum() + received['amount'].sum())
-            
-            # Determine node type
-            if len(sent) > 0 and len(received) > 0:
-                node_type = "both"
-            elif len(sent) > 0:
-                node_type = "sender"
-            else:
-                node_type = "receiver"
-            
-            # Calculate average fraud probability
-            all_txns = pd.concat([sent, received])
-            avg_fraud_prob = float(all_txns['fraud_probability'].mean()) if len(all_txns) > 0 else 0.0
-            
+        # Per-account statistics in one pass each, instead of a scan per account
+        num_accounts = len(account_ids)
+        sent_count = np.bincount(txns['sender'], minlength=num_accounts)[all_accounts]
+        received_count = np.bincount(txns['receiver'], minlength=num_accounts)[all_accounts]
+        volume = (
+            np.bincount(txns['sender'], weights=txns['amount'], minlength=num_accounts) +
+            np.bincount(txns['receiver'], weights=txns['amount'], minlength=num_accounts)
+        )[all_accounts]
+        prob_sum = (
+            np.bincount(txns['sender'], weights=txns['fraud_probability'], minlength=num_accounts) +
+            np.bincount(txns['receiver'], weights=txns['fraud_probability'], minlength=num_accounts)
+        )[all_accounts]
+        
+        transaction_counts = sent_count + received_count
+        
+        # Determine node type
+        node_types = np.select(
+            [(sent_count > 0) & (received_count > 0), sent_count > 0], ['both', 'sender'], default='receiver'
+        )
+        
+        # Calculate average fraud probability
+        avg_fraud_probs = np.divide(prob_sum, transaction_counts, out=np.zeros(len(all_accounts)),
+                                    where=transaction_counts > 0)
+        
+        for account, transaction_count, total_volume, avg_fraud_prob, node_type in zip(
+            account_ids[all_accounts].tolist(), transaction_counts.tolist(), volume.tolist(),
+            avg_fraud_probs.tolist(), node_types.tolist()
+        ):
             nodes[account] = NetworkNode(
                 id=account,
                 account_id=account,
@@ -115,89 +180,71 @@ class NetworkAnalysisService:
         return nodes
     
     @staticmethod
-    def _detect_fraud_rings(pairs: pd.DataFrame, df: pd.DataFrame) -> List[FraudRing]:
+    def _detect_fraud_rings(nodes: np.ndarray, endpoints: np.ndarray, txns: Dict[str, np.ndarray],
+                            account_ids: np.ndarray) -> List[FraudRing]:
         """
-        Detect fraud rings using graph algorithms
+        Detect fraud rings as strongly connected components of the pair graph
+        
+        Every account in a strongly connected component can reach every other
+        one along the directed edges, so a component of 3+ accounts always
+        contains a cycle through them.
         
         Args:
-            pairs: Transaction pairs DataFrame
-            df: Original transaction data
+            nodes: Sorted codes of the accounts in a pair
+            endpoints: Position in nodes of each pair's sender, then of each pair's receiver
+            txns: Coded suspicious transactions the pairs were built from
+            account_ids: Account id for each code
             
         Returns:
-            List of detected fraud rings
+            Up to 10 rings, ordered by their first account id
         """
-        # Build adjacency list
-        graph = defaultdict(set)
-        for _, row in pairs.iterrows():
-            graph[row['sender']].add(row['receiver'])
+        # Graph over compact node ids (positions in nodes, so id order is code order)
+        if len(nodes) == 0:
+            return []
+        senders, receivers = np.split(endpoints, 2)
+        graph = csr_matrix((np.ones(len(senders), dtype=np.int8), (senders, receivers)), shape=(len(nodes), len(nodes)))
+        _, labels = connected_components(graph, directed=True, connection='strong')
         
-        # Find strongly connected components (potential rings)
-        rings = []
-        visited = set()
-        ring_id = 1
+        # Components with 3+ accounts, in order of their smallest member (ring needs at least 3 accounts)
+        component_ids, first_member, sizes = np.unique(labels, return_index=True, return_counts=True)
+        rings_found = component_ids[sizes >= 3][np.argsort(first_member[sizes >= 3], kind='stable')]
         
-        for start_node in graph.keys():
-            if start_node in visited:
-                continue
-            
-            # BFS to find connected components
-            component = NetworkAnalysisService._find_connected_component(
-                start_node, graph, visited
-            )
-            
-            if len(component) >= 3:  # Ring needs at least 3 accounts
-                # Check if it's actually a ring (cyclic)
-                if NetworkAnalysisService._is_cyclic(component, graph):
-                    # Calculate ring statistics
-                    ring_txns = df[
-                        df['sender_account'].isin(component) &
-                        df['receiver_account'].isin(component)
-                    ]
-                    
-                    rings.append(FraudRing(
-                        ring_id=f"RING_{ring_id:03d}",
-                        account_count=len(component),
-                        transaction_count=len(ring_txns),
-                        total_volume=float(ring_txns['amount'].sum()),
-                        avg_fraud_probability=float(ring_txns['fraud_probability'].mean()),
-                        accounts=list(component)[:10]  # Limit to 10 for display
-                    ))
-                    ring_id += 1
-        
-        return rings[:10]  # Return top 10 rings
-    
-    @staticmethod
-    def _find_connected_component(start: str, graph: Dict, visited: Set) -> Set[str]:
-        """Find connected component using BFS"""
-        component = set()
-        queue = deque([start])
-        
-        while queue:
-            node = queue.popleft()
-            if node in visited:
-                continue
-            
-            visited.add(node)
-            component.add(node)
+        # Tag each account with its ring number (only the returned rings, so int8) and each
+        # transaction with its endpoints' ring when both share one. A stable radix sort then
+        # groups every ring's transactions, still in row order, in one pass
+        rings_found = rings_found[:10]  # Return top 10 rings
+        ring_of_component = np.full(len(component_ids), -1, dtype=np.int8)
+        ring_of_component[rings_found] = np.arange(len(rings_found))
+        account_ring = np.full(len(account_ids), -1, dtype=np.int8)
+        account_ring[nodes] = ring_of_component[labels]
+        sender_ring = account_ring[txns['sender']]
+        internal = np.flatnonzero((sender_ring == account_ring[txns['receiver']]) & (sender_ring >= 0))
+        internal = internal[np.argsort(sender_ring[internal], kind='stable')]
+        ring_sizes = np.bincount(sender_ring[internal], minlength=len(rings_found))
+        stops = np.cumsum(ring_sizes)
+        starts = stops - ring_sizes
+        
+        rings = []
+        for ring_id, (component, start, stop) in enumerate(
+            zip(rings_found.tolist(), starts.tolist(), stops.tolist()), start=1
+        ):
+            # Calculate ring statistics
+            members = nodes[labels == component]
+            ring_txns = internal[start:stop]
             
-            # Add neighbors
-            for neighbor in graph.get(node, []):
-                if neighbor not in visited:
-                    queue.append(neighbor)
+            rings.append(FraudRing(
+                ring_id=f"RING_{ring_id:03d}",
+                account_count=len(members),
+                transaction_count=len(ring_txns),
+                total_volume=float(txns['amount'][ring_txns].sum()),
+                avg_fraud_probability=float(txns['fraud_probability'][ring_txns].mean()),
+                accounts=[account_ids[code] for code in members[:10].tolist()]  # Limit to 10 for display
+            ))
         
-        return component
-    
-    @staticmethod
-    def _is_cyclic(component: Set[str], graph: Dict) -> bool:
-        """Check if component contains cycles"""
-        # Simple check: if any node in component points to another in component
-        for node in component:
-            neighbors = graph.get(node, set())
-            if any(n in component and n != node for n in neighbors):
-                return True
-        return False
+        return rings
     
     @staticmethod
+    @cached(expires=False)
     def detect_mule_accounts(min_senders: int = 5, 
                             redistribution_threshold: float = 0.8) -> List[Dict[str, Any]]:
         """
@@ -211,33 +258,61 @@ class NetworkAnalysisService:
             List of potential mule accounts
         """
         df = data_loader.get_data()
+        account_ids, sender_codes, receiver_codes = data_loader.get_account_codes()
+        num_accounts = len(account_ids)
         
-        # Get accounts that receive from many and send to many
-        received = df.groupby('receiver_account').agg({
-            'sender_account': 'nunique',
-            'amount': 'sum',
-            'fraud_probability': 'mean'
-        }).reset_index()
-        received.columns = ['account', 'unique_senders', 'amount_received', 'avg_fraud_prob']
-        
-        sent = df.groupby('sender_account').agg({
-            'receiver_account': 'nunique',
-            'amount': 'sum'
-        }).reset_index()
-        sent.columns = ['account', 'unique_receivers', 'amount_sent']
-        
-        # Merge
-        mule_candidates = received.merge(sent, on='account', how='inner')
-        
-        # Filter: many senders, quick redistribution
-        mule_candidates['redistribution_ratio'] = (
-            mule_candidates['amount_sent'] / mule_candidates['amount_received']
-        ).fillna(0)
-        
-        mules = mule_candidates[
-            (mule_candidates['unique_senders'] >= min_senders) &
-            (mule_candidates['redistribution_ratio'] >= redistribution_threshold)
-        ]
+        # Missing values count as SQL NULLs: skipped by the sums and the average
+        amount = df['amount'].to_numpy(dtype=np.float64)
+        fraud_probability = df['fraud_probability'].to_numpy(dtype=np.float64)
+        received, sent = receiver_codes >= 0, sender_codes >= 0
         
-        return mules.head(20).to_dict('records')
+        # Distinct (receiver, sender) links give both distinct counterpart counts (sort and
+        # drop repeats: faster than np.unique's hash table for this many distinct keys)
+        linked = received & sent
+        links = np.sort(receiver_codes[linked].astype(np.int64) * num_accounts + sender_codes[linked])
+        links = links[np.r_[True, links[1:] != links[:-1]]] if len(links) else links
+        unique_senders = np.bincount(links // num_accounts, minlength=num_accounts)
+        unique_receivers = np.bincount(links % num_accounts, minlength=num_accounts)
+        
+        def per_account(codes: np.ndarray, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+            """Sum of the non-missing values per account code, and how many there were"""
+            present = ~np.isnan(values)
+            return (np.bincount(codes[present], weights=values[present], minlength=num_accounts),
+                    np.bincount(codes[present], minlength=num_accounts))
+        
+        amount_received, amounts_received = per_account(receiver_codes[received], amount[received])
+        amount_sent, amounts_sent = per_account(sender_codes[sent], amount[sent])
+        prob_sum, probs = per_account(receiver_codes[received], fraud_probability[received])
+        
+        # Accounts that receive from many and send to many; the ratio is 0 when a sum has no values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            redistribution_ratio = np.where((amounts_sent > 0) & (amounts_received > 0),
+                                            amount_sent / amount_received, 0.0)
+            avg_fraud_prob = np.where(probs > 0, prob_sum / probs, np.nan)
+        is_mule = (
+            (np.bincount(receiver_codes[received], minlength=num_accounts) > 0) &
+            (np.bincount(sender_codes[sent], minlength=num_accounts) > 0) &
+            (unique_senders >= min_senders) &
+            (redistribution_ratio >= redistribution_threshold)
+        )
+        
+        # Codes follow account id order, so the first 20 codes are the first 20 ids
+        mules = np.flatnonzero(is_mule)[:20]
+        return [
+            {
+                'account': account,
+                'unique_senders': senders,
+                'amount_received': received_sum if received_count else np.nan,
+                'avg_fraud_prob': avg_prob,
+                'unique_receivers': receivers,
+                'amount_sent': sent_sum if sent_count else np.nan,
+                'redistribution_ratio': ratio
+            }
+            for account, senders, received_sum, received_count, avg_prob, receivers, sent_sum, sent_count, ratio in zip(
+                account_ids[mules].tolist(), unique_senders[mules].tolist(),
+                amount_received[mules].tolist(), amounts_received[mules].tolist(), avg_fraud_prob[mules].tolist(),
+                unique_receivers[mules].tolist(), amount_sent[mules].tolist(), amounts_sent[mules].tolist(),
+                redistribution_ratio[mules].tolist()
+            )
+        ]
 
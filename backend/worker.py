@@ -0,0 +1,29 @@
+"""
+Gunicorn worker class for production deployments
+
+Usage:
+    gunicorn backend.main:app --worker-class backend.worker.FraudAPIWorker
+"""
+from uvicorn.workers import UvicornWorker
+
+from backend.config import settings
+
+
+class FraudAPIWorker(UvicornWorker):
+    """
+    UvicornWorker pinned to the uvloop event loop and httptools parser
+    
+    The stock worker only picks these when it can import them ("auto"), so
+    a missing wheel silently drops back to asyncio and h11. Naming them here
+    fails fast instead. Concurrency is capped so an overloaded worker sheds
+    load with 503s rather than queueing without bound, and uvicorn's access
+    log is off because the request-logging middleware in backend.main
+    already records every request with its duration.
+    """
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "limit_concurrency": settings.LIMIT_CONCURRENCY,
+        "timeout_keep_alive": settings.KEEP_ALIVE_TIMEOUT,
+        "access_log": False,
+    }
@@ -160,13 +160,9 @@ def start_backend():
         ]
     
     try:
-        process = subprocess.Popen(
-            cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
+        # Output goes straight to this console: nothing reads a pipe, and a
+        # full pipe buffer would block the server
+        process = subprocess.Popen(cmd)
         
         print("⏳ Waiting for backend to start...")
         time.sleep(3)
@@ -195,27 +191,20 @@ def start_frontend():
         print("❌ Frontend directory not found")
         return None
     
+    # As with the backend, output is inherited rather than piped
     try:
         if platform.system() == "Windows":
             # Windows
             process = subprocess.Popen(
                 ['npm.cmd', 'run', 'dev'],
                 cwd=str(frontend_path),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
                 creationflags=subprocess.CREATE_NEW_CONSOLE if platform.system() == "Windows" else 0
             )
         else:
             # Unix
             process = subprocess.Popen(
                 ['npm', 'run', 'dev'],
-                cwd=str(frontend_path),
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1
+                cwd=str(frontend_path)
             )
         
         print("⏳ Waiting for frontend to start...")
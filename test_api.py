@@ -2,7 +2,9 @@
 Quick API Test Script - Verify all endpoints are working
 """
 import requests
+from requests.adapters import HTTPAdapter
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import sys
 
@@ -10,6 +12,10 @@ import sys
 BASE_URL = "http://localhost:8000"
 API_V1 = f"{BASE_URL}/api/v1"
 
+# One keep-alive connection pool shared by the test threads (sized for them)
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=8, pool_maxsize=16))
+
 
 def print_header(text):
     """Print formatted header"""
@@ -34,9 +40,18 @@ def print_info(text):
 
 
 def test_endpoint(name, url, expected_keys=None):
-    """Test a single endpoint"""
+    """
+    Test a single endpoint
+    
+    Safe to run from several threads at once: the report is returned
+    instead of printed, so it can be shown in order afterwards.
+    
+    Returns:
+        (passed, report lines)
+    """
+    lines = []
     try:
-        response = requests.get(url, timeout=30)
+        response = SESSION.get(url, timeout=30)
         
         if response.status_code == 200:
             data = response.json()
@@ -45,33 +60,81 @@ def test_endpoint(name, url, expected_keys=None):
             if expected_keys:
                 missing_keys = [key for key in expected_keys if key not in data]
                 if missing_keys:
-                    print_error(f"{name} - Missing keys: {missing_keys}")
-                    return False
+                    lines.append(f"❌ {name} - Missing keys: {missing_keys}")
+                    return False, lines
             
-            # Print sample of response
-            print_success(f"{name}")
-            print(f"   Status: {response.status_code}")
-            print(f"   Time: {response.elapsed.total_seconds():.3f}s")
+            # Sample of response
+            lines.append(f"✅ {name}")
+            lines.append(f"   Status: {response.status_code}")
+            lines.append(f"   Time: {response.elapsed.total_seconds():.3f}s")
             
-            # Print some key data
+            # Some key data
             if isinstance(data, dict):
                 sample_keys = list(data.keys())[:3]
                 for key in sample_keys:
                     value = data[key]
                     if isinstance(value, (int, float, str, bool)):
-                        print(f"   {key}: {value}")
+                        lines.append(f"   {key}: {value}")
             
-            return True
+            return True, lines
         else:
-            print_error(f"{name} - Status: {response.status_code}")
-            return False
+            lines.append(f"❌ {name} - Status: {response.status_code}")
+            return False, lines
             
     except requests.exceptions.ConnectionError:
-        print_error(f"{name} - Connection failed. Is server running?")
-        return False
+        lines.append(f"❌ {name} - Connection failed. Is server running?")
+        return False, lines
     except Exception as e:
-        print_error(f"{name} - Error: {str(e)}")
-        return False
+        lines.append(f"❌ {name} - Error: {str(e)}")
+        return False, lines
+
+
+# (section header, [(name, url, expected keys), ...])
+TEST_SECTIONS = [
+    ("1️⃣  System Health", [
+        ("Health Check", f"{BASE_URL}/health", ["status", "timestamp", "data_loaded"]),
+    ]),
+    ("2️⃣  Executive Dashboard Endpoints", [
+        ("Executive Overview", f"{API_V1}/dashboard/executive-overview",
+         ["fraud_amount_today", "fraud_rate_24h", "alerts_pending"]),
+        ("High-Risk Transactions", f"{API_V1}/dashboard/high-risk-transactions?limit=5",
+         ["critical_alerts", "total_alerts"]),
+        ("Fraud Velocity Heatmap", f"{API_V1}/dashboard/fraud-velocity-heatmap",
+         ["hourly_rates", "peak_attack_window"]),
+        ("Fraud Type Breakdown", f"{API_V1}/dashboard/fraud-type-breakdown",
+         ["fraud_types", "dominant_type"]),
+        ("Behavioral Anomalies", f"{API_V1}/dashboard/behavioral-anomalies",
+         ["anomalies", "total_anomalies"]),
+        ("Smart Alerts", f"{API_V1}/dashboard/smart-alerts",
+         ["critical_alerts", "warning_alerts"]),
+    ]),
+    ("3️⃣  Analytics Endpoints", [
+        ("Geo-Anomaly Hotspots", f"{API_V1}/analytics/geo-anomaly-hotspots",
+         ["high_risk_corridors", "impossible_travel_count"]),
+        ("Predictive Risk Scores", f"{API_V1}/analytics/predictive-risk-scores?limit=10",
+         ["high_probability_targets", "total_at_risk"]),
+        ("Financial Impact", f"{API_V1}/analytics/financial-impact?period_days=30",
+         ["fraud_prevented", "net_savings", "roi_percentage"]),
+        ("Customer Experience", f"{API_V1}/analytics/customer-experience",
+         ["blocked_transactions", "satisfaction_score"]),
+        ("Temporal Trends", f"{API_V1}/analytics/temporal-trends",
+         ["historical_trend", "forecast"]),
+        ("Merchant/Channel Risk", f"{API_V1}/analytics/merchant-channel-risk",
+         ["risk_matrix", "highest_risk_combination"]),
+    ]),
+    ("4️⃣  Network Analysis Endpoints", [
+        ("Fraud Network Graph", f"{API_V1}/network/fraud-network-graph?min_fraud_prob=0.7",
+         ["nodes", "edges", "fraud_rings"]),
+        ("Mule Accounts Detection", f"{API_V1}/network/mule-accounts?min_senders=5", None),
+    ]),
+    ("5️⃣  Model Monitoring Endpoints", [
+        ("Model Health", f"{API_V1}/model/model-health",
+         ["current_metrics", "recommendation"]),
+        ("Confusion Matrix", f"{API_V1}/model/confusion-matrix",
+         ["true_positive", "false_positive"]),
+        ("Feature Importance", f"{API_V1}/model/feature-importance", None),
+    ]),
+]
 
 
 def main():
@@ -80,123 +143,19 @@ def main():
     print(f"Testing API at: {BASE_URL}")
     print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    results = []
-    
-    # Test 1: Health Check
-    print_header("1️⃣  System Health")
-    results.append(test_endpoint(
-        "Health Check",
-        f"{BASE_URL}/health",
-        expected_keys=["status", "timestamp", "data_loaded"]
-    ))
-    
-    # Test 2: Executive Dashboard
-    print_header("2️⃣  Executive Dashboard Endpoints")
-    results.append(test_endpoint(
-        "Executive Overview",
-        f"{API_V1}/dashboard/executive-overview",
-        expected_keys=["fraud_amount_today", "fraud_rate_24h", "alerts_pending"]
-    ))
-    
-    results.append(test_endpoint(
-        "High-Risk Transactions",
-        f"{API_V1}/dashboard/high-risk-transactions?limit=5",
-        expected_keys=["critical_alerts", "total_alerts"]
-    ))
-    
-    results.append(test_endpoint(
-        "Fraud Velocity Heatmap",
-        f"{API_V1}/dashboard/fraud-velocity-heatmap",
-        expected_keys=["hourly_rates", "peak_attack_window"]
-    ))
-    
-    results.append(test_endpoint(
-        "Fraud Type Breakdown",
-        f"{API_V1}/dashboard/fraud-type-breakdown",
-        expected_keys=["fraud_types", "dominant_type"]
-    ))
-    
-    results.append(test_endpoint(
-        "Behavioral Anomalies",
-        f"{API_V1}/dashboard/behavioral-anomalies",
-        expected_keys=["anomalies", "total_anomalies"]
-    ))
-    
-    results.append(test_endpoint(
-        "Smart Alerts",
-        f"{API_V1}/dashboard/smart-alerts",
-        expected_keys=["critical_alerts", "warning_alerts"]
-    ))
+    # The endpoints are independent, so they are requested concurrently and
+    # the wall time is about that of the slowest one; map keeps the order
+    tests = [test for _, section_tests in TEST_SECTIONS for test in section_tests]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        outcomes = iter(list(executor.map(lambda test: test_endpoint(*test), tests)))
     
-    # Test 3: Analytics
-    print_header("3️⃣  Analytics Endpoints")
-    results.append(test_endpoint(
-        "Geo-Anomaly Hotspots",
-        f"{API_V1}/analytics/geo-anomaly-hotspots",
-        expected_keys=["high_risk_corridors", "impossible_travel_count"]
-    ))
-    
-    results.append(test_endpoint(
-        "Predictive Risk Scores",
-        f"{API_V1}/analytics/predictive-risk-scores?limit=10",
-        expected_keys=["high_probability_targets", "total_at_risk"]
-    ))
-    
-    results.append(test_endpoint(
-        "Financial Impact",
-        f"{API_V1}/analytics/financial-impact?period_days=30",
-        expected_keys=["fraud_prevented", "net_savings", "roi_percentage"]
-    ))
-    
-    results.append(test_endpoint(
-        "Customer Experience",
-        f"{API_V1}/analytics/customer-experience",
-        expected_keys=["blocked_transactions", "satisfaction_score"]
-    ))
-    
-    results.append(test_endpoint(
-        "Temporal Trends",
-        f"{API_V1}/analytics/temporal-trends",
-        expected_keys=["historical_trend", "forecast"]
-    ))
-    
-    results.append(test_endpoint(
-        "Merchant/Channel Risk",
-        f"{API_V1}/analytics/merchant-channel-risk",
-        expected_keys=["risk_matrix", "highest_risk_combination"]
-    ))
-    
-    # Test 4: Network Analysis
-    print_header("4️⃣  Network Analysis Endpoints")
-    results.append(test_endpoint(
-        "Fraud Network Graph",
-        f"{API_V1}/network/fraud-network-graph?min_fraud_prob=0.7",
-        expected_keys=["nodes", "edges", "fraud_rings"]
-    ))
-    
-    results.append(test_endpoint(
-        "Mule Accounts Detection",
-        f"{API_V1}/network/mule-accounts?min_senders=5"
-    ))
-    
-    # Test 5: Model Monitoring
-    print_header("5️⃣  Model Monitoring Endpoints")
-    results.append(test_endpoint(
-        "Model Health",
-        f"{API_V1}/model/model-health",
-        expected_keys=["current_metrics", "recommendation"]
-    ))
-    
-    results.append(test_endpoint(
-        "Confusion Matrix",
-        f"{API_V1}/model/confusion-matrix",
-        expected_keys=["true_positive", "false_positive"]
-    ))
-    
-    results.append(test_endpoint(
-        "Feature Importance",
-        f"{API_V1}/model/feature-importance"
-    ))
+    results = []
+    for header, section_tests in TEST_SECTIONS:
+        print_header(header)
+        for _ in section_tests:
+            passed, lines = next(outcomes)
+            print("\n".join(lines))
+            results.append(passed)
     
     # Summary
     print_header("📊 TEST SUMMARY")
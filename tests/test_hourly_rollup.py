@@ -0,0 +1,55 @@
+"""
+Hourly rollup aggregates against the pandas groupby they replace
+"""
+import numpy as np
+import pandas as pd
+
+from backend.config import settings
+from backend.data.data_loader import DataLoader, PREVENTION_THRESHOLD
+
+
+def _transactions(num_rows: int = 2000) -> pd.DataFrame:
+    """Time-sorted rows over a few days, with missing amounts and velocity scores"""
+    rng = np.random.default_rng(0)
+    timestamps = np.sort(
+        pd.Timestamp('2023-01-01').value + rng.integers(0, 3 * 24 * 3600, num_rows) * 1_000_000_000
+    ).view('datetime64[ns]')
+    amount = rng.gamma(2.0, 500.0, num_rows).astype(np.float32)
+    amount[rng.random(num_rows) < 0.1] = np.nan
+    velocity = rng.random(num_rows).astype(np.float32)
+    velocity[rng.random(num_rows) < 0.1] = np.nan
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'is_fraud': rng.random(num_rows) < 0.2,
+        'amount': amount,
+        'fraud_probability': rng.random(num_rows).astype(np.float32),
+        'velocity_score': velocity
+    })
+
+
+def test_rollup_skips_missing_values_like_pandas():
+    df = _transactions()
+    # One hour where every velocity score is missing: its mean stays NaN
+    df.loc[df['timestamp'] < pd.Timestamp('2023-01-01 01:00'), 'velocity_score'] = np.nan
+    rollup = DataLoader._hourly_rollup(df, df['timestamp'].to_numpy().view('i8'))
+    
+    amount = df['amount'].astype(np.float64)
+    high_risk = df['fraud_probability'] >= settings.HIGH_RISK_THRESHOLD
+    prevented = (df['fraud_probability'] >= PREVENTION_THRESHOLD) & ~df['is_fraud']
+    expected = pd.DataFrame({
+        'fraud_amount': amount.where(df['is_fraud']),
+        'high_risk_amount': amount.where(high_risk),
+        'prevented_amount': amount.where(prevented),
+        'velocity': df['velocity_score'].astype(np.float64)
+    }).groupby(df['timestamp'].dt.floor('h')).agg({
+        'fraud_amount': 'sum', 'high_risk_amount': 'sum', 'prevented_amount': 'sum', 'velocity': 'mean'
+    })
+    
+    assert not rollup[['fraud_amount', 'high_risk_amount', 'prevented_amount', 'velocity_sum']].isna().any().any()
+    np.testing.assert_array_equal(rollup['bucket'].to_numpy(), expected.index.to_numpy())
+    for column in ['fraud_amount', 'high_risk_amount', 'prevented_amount']:
+        np.testing.assert_allclose(rollup[column].to_numpy(), expected[column].to_numpy(), rtol=1e-12)
+    with np.errstate(invalid='ignore'):
+        velocity_mean = rollup['velocity_sum'].to_numpy() / rollup['velocity_count'].to_numpy()
+    np.testing.assert_allclose(velocity_mean, expected['velocity'].to_numpy(), rtol=1e-12)
+    assert np.isnan(velocity_mean[0])
@@ -0,0 +1,34 @@
+"""
+M4 downsampling of the temporal trend series
+"""
+import numpy as np
+
+from backend.services.analytics import AnalyticsService
+
+
+def _daily_series(num_days: int = 730):
+    """Two years of daily points (the longest /temporal-trends window)"""
+    rng = np.random.default_rng(0)
+    x = np.datetime64('2022-01-01') + np.arange(num_days).astype('timedelta64[D]')
+    return x, rng.random(num_days)
+
+
+def test_short_series_unchanged():
+    x, y = _daily_series(365)
+    np.testing.assert_array_equal(AnalyticsService._m4_indices(x, y, 1200), np.arange(365))
+
+
+def test_long_series_reduced_to_chart_width():
+    x, y = _daily_series()
+    pixels = 100
+    keep = AnalyticsService._m4_indices(x, y, pixels)
+    
+    assert len(keep) <= 4 * pixels < len(x)
+    assert np.all(np.diff(keep) > 0)
+    
+    # Every pixel keeps its first, last, lowest and highest point
+    bins = np.minimum((np.arange(len(x)) * pixels) // (len(x) - 1), pixels - 1)
+    for pixel in range(pixels):
+        members = np.flatnonzero(bins == pixel)
+        for position in (members[0], members[-1], members[np.argmin(y[members])], members[np.argmax(y[members])]):
+            assert position in keep